@@ -2,12 +2,16 @@ CLINGO_BIN_PATH = 'clingo'
 __version__ = '0.5.2'
 
 from clyngor.utils import ASPSyntaxError, ASPWarning, parse_clingo_output, clingo_value_to_python, with_clingo_bin, opt_models_from_clyngor_answers, answer_set_to_str, answer_set_from_str, try_python_availability_in_clingo, try_lua_availability_in_clingo
-from clyngor.answers import Answers, ClingoAnswers
-from clyngor.solving import solve, clingo_version, command
-from clyngor.grounding import solve_from_grounded, grounded_program
+from clyngor.answers import Answers, AsyncAnswers, ClingoAnswers
+from clyngor.solving import solve, solve_many, asolve, consequences, cautious, brave, count_models, tune, clingo_version, command
+from clyngor.grounding import solve_from_grounded, grounded_program, GroundingCache, ground_and_solve, ground_to_file, solve_from_grounded_file
 from clyngor.inline import ASP
 from clyngor.decoder import decode
 from clyngor.propagators import Propagator, Variable, Main, Constraint
+from clyngor.pool import SolverPool
+from clyngor.session import Session
+from clyngor.observers import GroundProgramObserver
+from clyngor.archive import ModelWriter, ModelReader
 
 
 def load_clingo_module() -> bool:
@@ -1,9 +1,12 @@
 
+import tracemalloc
 from timeit import timeit
 from pprint import pprint
 from functools import partial
 
 from clyngor import ASP
+from clyngor.answers import Answers
+from clyngor.parsing import Parser
 
 
 ASP_CODE = """
@@ -19,6 +22,31 @@ def time_efficiency(number:int=1000) -> float:
         return tuple(ASP(ASP_CODE))
     return 'Perform {} calls in {} seconds.'.format(number, round(timeit(run, number=number), 2))
 
+def parsing_efficiency(nb_model:int=20, nb_atom:int=2000) -> str:
+    """Compare the tokenizer and the arpeggio parser on large models"""
+    model = ' '.join('p({},"a b",f(b,({},2)))'.format(idx, -idx) for idx in range(nb_atom))
+    parser = Parser(collapse_args=False)
+    assert parser.parse_terms(model) == parser.arpeggio_parse_terms(model)
+    tokenizer = timeit(partial(parser.parse_terms, model), number=nb_model)
+    arpeggio = timeit(partial(parser.arpeggio_parse_terms, model), number=nb_model)
+    return 'Parse {} models of {} atoms in {} seconds (arpeggio: {} seconds).'.format(
+        nb_model, nb_atom, round(tokenizer, 2), round(arpeggio, 2))
+
+def interning_efficiency(nb_model:int=2000, nb_atom:int=200) -> str:
+    """Compare memory used to keep all models, with and without interned atoms"""
+    models = [' '.join('p({},"a")'.format(idx) for idx in range(start, start + nb_atom))
+              for start in range(nb_model)]  # consecutive models share most atoms
+    def memory_used(answers:Answers) -> int:
+        tracemalloc.start()
+        kept = tuple(answers)
+        used = tracemalloc.get_traced_memory()[0]
+        tracemalloc.stop()
+        return used
+    regular = memory_used(Answers(models))
+    interned = memory_used(Answers(models).interned)
+    return 'Keep {} models of {} atoms in {} MB ({} MB when interned).'.format(
+        nb_model, nb_atom, round(regular / 2**20, 1), round(interned / 2**20, 1))
+
 
 if __name__ == '__main__':
     answers = ASP(ASP_CODE)
@@ -28,4 +56,6 @@ if __name__ == '__main__':
 
     print('Benchmark:')
     print(time_efficiency())
+    print(parsing_efficiency())
+    print(interning_efficiency())
     print()
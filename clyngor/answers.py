@@ -2,6 +2,8 @@
 
 
 import re
+import time
+from array import array
 from collections import defaultdict
 
 import clyngor
@@ -33,6 +35,43 @@ def naive_parsing_of_answer_set(answer_set:str, *, discard_quotes:bool=False, pa
         # print('\t>', pred, args)
 
 
+class LazyModel:
+    """An answer set as given by the solver, parsed and formatted
+    only at the first access to its atoms.
+
+    raw -- the answer set, as given by the solver
+    cost -- optimization of the answer set
+    optimality -- True if the answer set is proven optimal
+    number -- answer number given by the solver
+
+    """
+    __slots__ = ('raw', 'cost', 'optimality', 'number', '_formatter', '_atoms')
+
+    def __init__(self, raw, cost, optimality:bool, number:int, formatter:callable):
+        self.raw, self.cost, self.optimality, self.number = raw, cost, optimality, number
+        self._formatter = formatter
+        self._atoms = None
+
+    @property
+    def atoms(self) -> dict or frozenset:
+        """The answer set, formatted as Answers would have yield it"""
+        if self._atoms is None:
+            self._atoms = self._formatter(self.raw)
+        return self._atoms
+
+    def __iter__(self):
+        return iter(self.atoms)
+
+    def __len__(self) -> int:
+        return len(self.atoms)
+
+    def __contains__(self, atom) -> bool:
+        return atom in self.atoms
+
+    def __repr__(self):
+        return '<LazyModel {} {}>'.format(self.number, repr(self.raw))
+
+
 class Answers:
     """Proxy to the solver, generated by solving methods like solve.solve
     or inline.ASP.
@@ -76,6 +115,9 @@ class Answers:
         self._with_optimization = False
         self._with_optimality = False
         self._with_answer_number = False
+        self._interned = False
+        self._lazy = False
+        self._intern_table = {}  # atom -> the same atom, first seen instance
         self.__on_end = on_end or (lambda: None)
         self.__specific_statuses = specific_statuses
 
@@ -201,6 +243,22 @@ class Answers:
         self._collapse_args = False
         return self
 
+    @property
+    def interned(self):
+        """Equal atoms of all answer sets are the same object, reducing
+        memory usage when answer sets are kept, and speeding up
+        comparisons between answer sets."""
+        self._interned = True
+        return self
+
+    @property
+    def lazy(self):
+        """Yield LazyModel instances instead of answer sets, giving access
+        to the raw answer set, optimization, optimality and answer number,
+        while parsing and formatting only answer sets whose atoms are accessed."""
+        self._lazy = True
+        return self
+
     @property
     def no_arg(self):
         """Do not parse arguments, and discard/ignore them.
@@ -215,23 +273,41 @@ class Answers:
 
     def __iter__(self):
         """Yield answer sets"""
-        for answer_set, optimization, optimality, answer_number in self._answers:
-            answer_set = tuple(self._parse_answer(answer_set))
-            parsed = self._format(answer_set)
-            if self._with_answer_number:
-                yield parsed, optimization, optimality, answer_number
-            elif self._with_optimality:
-                yield parsed, optimization, optimality
-            elif self._with_optimization:
-                yield parsed, optimization
-            else:
-                yield parsed
+        for answer in self._answers:
+            yield self._parse_and_format(*answer)
         self.clean_resources()
 
+    def _parse_and_format(self, answer_set, optimization, optimality, answer_number):
+        """Return given answer set parsed and formatted according to options,
+        with the asked optimization data"""
+        if self._lazy:
+            return LazyModel(answer_set, optimization, optimality, answer_number, self._formatted)
+        parsed = self._formatted(answer_set)
+        if self._with_answer_number:
+            return parsed, optimization, optimality, answer_number
+        elif self._with_optimality:
+            return parsed, optimization, optimality
+        elif self._with_optimization:
+            return parsed, optimization
+        else:
+            return parsed
+
+    def _formatted(self, answer_set) -> dict or frozenset:
+        """Return given answer set parsed and formatted according to options"""
+        return self._format(tuple(self._parse_answer(answer_set)))
+
     def clean_resources(self):
         self.__on_end()
         self.__on_end = lambda: None  # don't call it again
 
+    def prefetch(self):
+        """Read all answer sets from the solver right now, raising its errors
+        if any, so that later iterations do not wait for the solver.
+        Return self."""
+        self._answers = iter(tuple(self._answers))
+        self.clean_resources()
+        return self
+
 
     def _parse_answer(self, answer_set:str) -> iter:
         """Yield atoms as (pred, args) from given answer set"""
@@ -243,7 +319,7 @@ class Answers:
             # _keep_quotes is incompatible with atoms_as_string and as_pyasp.
             # atom_as_string: remove the quotes delimiting arguments.
             # as_pyasp: remove the quotes for the arguments.
-            yield from parsing.Parser(
+            yield from parsing.cached_parser(
                 self._collapse_atoms, self._collapse_args,
                 discard_quotes,
                 self._first_arg_only,
@@ -281,20 +357,21 @@ class Answers:
         """
         sorted_tuple = lambda it: tuple(sorted(it))
         builder = sorted_tuple if self._sorted else frozenset
+        intern = (lambda atom: self._intern_table.setdefault(atom, atom)) if self._interned else (lambda atom: atom)
         if self._atoms_as_string:  # special case
-            return builder(answer_set)
+            return builder(map(intern, answer_set))
         elif self._ignore_args:
-            answer_set = (pred for pred, _ in answer_set)
+            answer_set = (intern(pred) for pred, _ in answer_set)
             if self._group_atoms:
                 return {pred: frozenset() for pred in answer_set}
             if self._as_pyasp:
                 return as_pyasp.TermSet(as_pyasp.Atom.from_tuple_repr((pred, ())) for pred in answer_set)
             return builder(answer_set)
         elif self._first_arg_only:
-            answer_set = builder((pred, args[0] if args else ())
+            answer_set = builder(intern((pred, args[0] if args else ()))
                                    for pred, args in answer_set)
         else:
-            answer_set = builder((pred, tuple(args))
+            answer_set = builder(intern((pred, tuple(args)))
                                    for pred, args in answer_set)
         # NB: as_pyasp flag behave differently if group_atoms is activated
         if self._group_atoms:
@@ -315,6 +392,50 @@ class Answers:
         return answer_set
 
 
+    def as_columns(self) -> (tuple, array, array):
+        """Consume all answer sets, and return them in compressed sparse row
+        format, built while reading them: the atoms, indexed by an integer ID,
+        and the arrays indptr and indices, such that the IDs of the atoms
+        of the Nth answer set are indices[indptr[N]:indptr[N+1]].
+
+        Atoms are formatted according to formatting options,
+        except the grouping by predicate, which is not supported.
+
+        """
+        if self._group_atoms:
+            raise ValueError("Answer sets grouped by predicate can't be given as columns")
+        atom_ids = {}  # atom -> ID
+        indptr, indices = array('l', [0]), array('l')
+        for answer_set, *_ in self._answers:
+            for atom in self._formatted(answer_set):
+                indices.append(atom_ids.setdefault(atom, len(atom_ids)))
+            indptr.append(len(indices))
+        self.clean_resources()
+        return tuple(atom_ids), indptr, indices
+
+    def as_matrix(self, sparse:bool=False) -> (object, tuple):
+        """Consume all answer sets, and return the boolean matrix
+        answer sets × atoms, with the atoms indexed by column.
+        See as_columns for supported formatting options.
+
+        sparse -- give a scipy.sparse.csr_matrix instead of a numpy array
+
+        Requires numpy, and scipy if sparse is truthy.
+
+        """
+        import numpy
+        atoms, indptr, indices = self.as_columns()
+        indptr, indices = numpy.asarray(indptr), numpy.asarray(indices)
+        shape = len(indptr) - 1, len(atoms)
+        if sparse:
+            from scipy.sparse import csr_matrix
+            data = numpy.ones(len(indices), dtype=bool)
+            return csr_matrix((data, indices, indptr), shape=shape), atoms
+        matrix = numpy.zeros(shape, dtype=bool)
+        matrix[numpy.repeat(numpy.arange(shape[0]), numpy.diff(indptr)), indices] = True
+        return matrix, atoms
+
+
     @property
     def _atoms_as_string(self) -> bool:
         """Shortcut"""
@@ -333,25 +454,78 @@ class Answers:
         return self.__specific_statuses.get("unknown", False)
 
 
+class AsyncAnswers(Answers):
+    """Asynchronous proxy to the solver, generated by solving.asolve.
+
+    Asynchronous iterable on the answer sets generated by the solver.
+    Also expose the same answer set formatting tunning as Answers.
+
+    """
+    def __init__(self, answers:'async iterable', command:str='', statistics:dict={},
+                 specific_statuses:dict={}, *, decoders:iter=(), on_end:callable=None):
+        """Answer sets must be an asynchronous iterable of 4-uplets
+        (answer set, optimization, optimality, answer number)"""
+        super().__init__((), command, statistics, specific_statuses,
+                         decoders=decoders, with_optimization=True, on_end=on_end)
+        self._answers = answers
+
+    def __iter__(self):
+        raise TypeError("AsyncAnswers instances must be iterated with 'async for'")
+
+    async def __aiter__(self):
+        """Yield answer sets"""
+        async for answer in self._answers:
+            yield self._parse_and_format(*answer)
+        self.clean_resources()
+
+
 class ClingoAnswers(Answers):
     """Proxy to the solver as called through the python clingo module.
 
     """
-    def __init__(self, solver, statistics:callable=(lambda: {})):
-        assert clyngor.have_clingo_module()
-        super().__init__(self.__compute_answers(), with_optimization=True, command='[clingo module call]')
+    def __init__(self, solver, statistics:callable=(lambda: {}), assumptions:iter=(),
+                 time_limit:float=0):
+        """
+        solver -- clingo.Control instance, ready to solve
+        assumptions -- literals or pairs (symbol, truth value) given to the solver
+        time_limit -- zero or number of seconds after which solving is canceled
+
+        """
+        assert clyngor.clingo_module_available
+        # filled once all models are found, from the solve result
+        self._specific_statuses = {'unsat': False, 'unknown': False}
+        super().__init__(self.__compute_answers(), with_optimization=True,
+                         command='[clingo module call]',
+                         specific_statuses=self._specific_statuses)
         self._solver = solver
+        self._assumptions = list(assumptions)
+        self._time_limit = time_limit
         self._statistics = lambda s=solver: s.statistics
         assert callable(self._statistics)
 
 
     def __compute_answers(self):
         kwargs = {'yield_': True, 'async_': True}  # compat with 3.7
+        if self._assumptions:
+            kwargs['assumptions'] = self._assumptions
+        deadline = time.monotonic() + self._time_limit if self._time_limit else None
         with self._solver.solve(**kwargs) as models:
-            for model in models:
-                answer_set = set(utils.clingo_symbol_as_python_value(a)
-                                 for a in model.symbols(shown=True))
+            as_python_value = utils.clingo_symbol_as_python_value
+            while True:
+                models.resume()
+                if deadline is not None:
+                    # wait for the next model, but not after time limit
+                    if not models.wait(max(0., deadline - time.monotonic())):
+                        models.cancel()
+                        break
+                model = models.model()
+                if model is None:
+                    break
+                answer_set = set(map(as_python_value, model.symbols(shown=True)))
                 yield answer_set, model.cost, model.optimality_proven, model.number
+            result = models.get()
+            self._specific_statuses['unsat'] = bool(result.unsatisfiable)
+            self._specific_statuses['unknown'] = bool(result.unknown)
 
     @property
     def statistics(self) -> dict:
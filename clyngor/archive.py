@@ -0,0 +1,220 @@
+"""Compact binary storage of answer sets, allowing to write models as they
+are found, and to read any of them without reading the others.
+
+File format: a header, then a sequence of records, each being
+a kind byte, a payload length as unsigned 32 bits integer, and the payload:
+
+- b'A' records define the next atom ID, payload being its python repr,
+  infinite numbers being written 1e999.
+- b'M' records define the next model, payload being the IDs of its atoms,
+  as little endian unsigned 32 bits integers, possibly zlib-compressed.
+
+Usage:
+
+    with ModelWriter('models.bin', compress=True) as writer:
+        for model in clyngor.solve('encoding.lp'):
+            writer.write(model)
+
+    with ModelReader('models.bin') as models:
+        print(len(models), models[42])
+
+"""
+
+import os
+import ast
+import sys
+import math
+import zlib
+import mmap
+import struct
+from array import array
+from collections.abc import Mapping
+
+
+MAGIC = b'CLYNGOR\x01'
+FLAG_COMPRESSED = 1
+RECORD_HEADER = struct.Struct('<cI')
+ATOM, MODEL = b'A', b'M'
+
+
+def _ids_to_bytes(ids:array, compress:bool) -> bytes:
+    if sys.byteorder == 'big':
+        ids = array('I', ids)
+        ids.byteswap()
+    data = ids.tobytes()
+    return zlib.compress(data) if compress else data
+
+def _ids_from_bytes(data:bytes, compress:bool) -> array:
+    ids = array('I', zlib.decompress(data) if compress else data)
+    if sys.byteorder == 'big':
+        ids.byteswap()
+    return ids
+
+
+def _atom_repr(atom:object) -> str:
+    """Return the representation of given atom, made of tuples, strings
+    and numbers, readable by ast.literal_eval"""
+    if isinstance(atom, tuple):
+        return '(' + ''.join(_atom_repr(value) + ',' for value in atom) + ')'
+    if isinstance(atom, float) and math.isinf(atom):
+        return '1e999' if atom > 0 else '-1e999'
+    if isinstance(atom, (str, int)) or (isinstance(atom, float) and not math.isnan(atom)):
+        return repr(atom)
+    raise TypeError("Atom {} of type {} can't be written in a models file."
+                    "".format(repr(atom), type(atom).__name__))
+
+
+class ModelWriter:
+    """Write answer sets in a file, one at a time, each distinct atom
+    being written only once."""
+
+    def __init__(self, filename:str, compress:bool=False, append:bool=False):
+        """
+        filename -- file to write
+        compress -- compress the models with zlib (ignored when appending,
+                    since the file states it)
+        append -- add models to the end of given existing file, removing
+                  its last record if it was not completely written
+
+        """
+        self._atom_ids = {}  # atom -> ID
+        self._nb_model = 0
+        end = None  # end of the last complete record of the file to append to
+        if append and os.path.exists(filename):
+            with ModelReader(filename) as reader:
+                self._atom_ids = {atom: idx for idx, atom in enumerate(reader.atoms)}
+                self._nb_model = len(reader)
+                self.compress = reader.compress
+                end = reader.end
+        if end:  # has a header
+            self._fd = open(filename, 'r+b')
+            self._fd.truncate(end)
+            self._fd.seek(end)
+        else:
+            self.compress = bool(compress)
+            self._fd = open(filename, 'wb')
+            self._fd.write(MAGIC + bytes((FLAG_COMPRESSED if compress else 0,)))
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *_):
+        self.close()
+
+    def __len__(self) -> int:
+        return self._nb_model
+
+    def close(self):
+        self._fd.close()
+
+    def flush(self):
+        """Make written models available to readers"""
+        self._fd.flush()
+
+
+    def write(self, answer_set:iter) -> int:
+        """Write given answer set, an iterable of atoms, and return its index"""
+        if isinstance(answer_set, Mapping):
+            raise TypeError("Answer sets must be written as iterables of atoms,"
+                            " not as mappings like the ones given by"
+                            " Answers.by_predicate or Answers.by_arity.")
+        ids = array('I')
+        for atom in answer_set:
+            idx = self._atom_ids.get(atom)
+            if idx is None:
+                payload = _atom_repr(atom).encode()  # raise before any change
+                idx = self._atom_ids[atom] = len(self._atom_ids)
+                self._write_record(ATOM, payload)
+            ids.append(idx)
+        self._write_record(MODEL, _ids_to_bytes(ids, self.compress))
+        self._nb_model += 1
+        return self._nb_model - 1
+
+    def write_all(self, answer_sets:iter) -> int:
+        """Write all given answer sets, and return the number of answer sets written"""
+        nb_model = self._nb_model
+        for answer_set in answer_sets:
+            self.write(answer_set)
+        return self._nb_model - nb_model
+
+    def _write_record(self, kind:bytes, payload:bytes):
+        self._fd.write(RECORD_HEADER.pack(kind, len(payload)))
+        self._fd.write(payload)
+
+
+class ModelReader:
+    """Random access to the answer sets written by a ModelWriter,
+    through a memory mapping of the file.
+
+    Opening the file reads the atom table and the position of each model,
+    but not the models themselves. A file whose header is not written yet,
+    e.g. by a writer not yet flushed, is read as an empty file.
+
+    """
+
+    def __init__(self, filename:str, answer_set_builder:type=frozenset):
+        """
+        filename -- file to read
+        answer_set_builder -- type of the answer sets, built from their atoms
+
+        """
+        self.answer_set_builder = answer_set_builder
+        self.atoms = []
+        self._offsets = array('Q')  # position and size of each model payload
+        self._sizes = array('I')
+        self.end = 0  # position of the end of the last complete record
+        with open(filename, 'rb') as fd:
+            start = fd.read(len(MAGIC) + 1)
+            if len(start) <= len(MAGIC) and MAGIC.startswith(start):
+                self._mmap, self.compress = None, False  # header not written yet
+                return
+            self._mmap = mmap.mmap(fd.fileno(), 0, access=mmap.ACCESS_READ)
+        if self._mmap[:len(MAGIC)] != MAGIC:
+            self._mmap.close()
+            raise ValueError("File {} is not a clyngor models file".format(filename))
+        self.compress = bool(self._mmap[len(MAGIC)] & FLAG_COMPRESSED)
+        pos, end = len(MAGIC) + 1, len(self._mmap)
+        self.end = pos
+        while pos + RECORD_HEADER.size <= end:
+            kind, size = RECORD_HEADER.unpack_from(self._mmap, pos)
+            pos += RECORD_HEADER.size
+            if pos + size > end:  # record is being written
+                break
+            if kind == ATOM:
+                self.atoms.append(ast.literal_eval(self._mmap[pos:pos+size].decode()))
+            elif kind == MODEL:
+                self._offsets.append(pos)
+                self._sizes.append(size)
+            else:
+                raise ValueError("Unexpected record kind {} in file {}".format(kind, filename))
+            pos += size
+            self.end = pos
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *_):
+        self.close()
+
+    def close(self):
+        if self._mmap is not None:
+            self._mmap.close()
+
+    def __len__(self) -> int:
+        return len(self._offsets)
+
+    def __getitem__(self, index:int) -> frozenset:
+        """Return the answer set of given index"""
+        atoms = self.atoms
+        return self.answer_set_builder(atoms[idx] for idx in self.ids(index))
+
+    def __iter__(self):
+        """Yield all answer sets"""
+        for index in range(len(self)):
+            yield self[index]
+
+    def ids(self, index:int) -> array:
+        """Return the IDs of the atoms of the answer set of given index,
+        IDs being indexes in self.atoms"""
+        offset, size = self._offsets[index], self._sizes[index]
+        return _ids_from_bytes(self._mmap[offset:offset+size], self.compress)
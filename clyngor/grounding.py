@@ -1,22 +1,315 @@
 """Implementation of decoupled grounding/solving interface"""
 
-from clyngor import solve
+import os
+import re
+import shlex
+import hashlib
+import tempfile
+import functools
+import subprocess
+from clyngor import solve, clingo_version
+from clyngor.answers import Answers
+from clyngor.solving import command, raise_on_stderr, _gen_answers
+from clyngor.utils import cleaned_path
 
 
 def solve_from_grounded(grounded_program:str, **kwargs_to_solver):
-    if 'options' not in kwargs_to_solver:
-        kwargs_to_solver['options'] = ''
-    kwargs_to_solver['options'] += ' --mode=clasp'
+    options = kwargs_to_solver.get('options', '')
+    options = shlex.split(options) if isinstance(options, str) else list(options)
+    kwargs_to_solver['options'] = options + ['--mode=clasp']
     if 'inline' in kwargs_to_solver:
         print('WARNING inline argument was passed to solve_from_grounded. It will be ignored.')
     kwargs_to_solver['inline'] = grounded_program
     return solve(**kwargs_to_solver)
 
 
-def grounded_program(files:iter=(), inline:str=None, **kwargs_to_solver) -> str:
-    "Return full grounded program, ready to be used by solve_from_grounded"
-    if 'options' not in kwargs_to_solver:
-        kwargs_to_solver['options'] = ''
-    kwargs_to_solver['options'] += ' --mode=gringo'
+def grounded_program(files:iter=(), inline:str=None, ground_cache:object=None,
+                     **kwargs_to_solver) -> str:
+    """Return full grounded program, ready to be used by solve_from_grounded
+
+    ground_cache -- GroundingCache instance, or directory of one, or True
+                    for the default one, used to reuse a grounding
+                    computed previously with the same input.
+
+    """
+    options = kwargs_to_solver.get('options', '')
+    options = shlex.split(options) if isinstance(options, str) else list(options)
+    kwargs_to_solver['options'] = options + ['--mode=gringo']
+    cache = as_grounding_cache(ground_cache)
+    if cache is not None:
+        files = [files] if isinstance(files, str) else files
+        if kwargs_to_solver.get('clean_path', True):
+            files = tuple(map(cleaned_path, files))
+        key = cache.key(files, inline, options, kwargs_to_solver.get('constants', {}),
+                        kwargs_to_solver.get('clingo_bin_path'))
+        grounded = cache.get(key)
+        if grounded is not None:
+            return grounded
     stdout, stderr = solve(files=files, inline=inline, return_raw_output=True, **kwargs_to_solver)
+    raise_on_stderr(iter(stderr.splitlines()), kwargs_to_solver.get('error_on_warning', False))
+    if cache is not None and stdout:
+        cache.put(key, stdout)
     return stdout
+
+
+def _run_gringo(files:iter, inline:str, options:iter, constants:dict,
+                clean_path:bool, clingo_bin_path:str, stdout:object) -> (subprocess.Popen, object):
+    """Start the grounding of given files and inline code, writing the grounded
+    program to given stdout, and return the process and its stderr file"""
+    files = [files] if isinstance(files, str) else files
+    files = tuple(map(cleaned_path, files) if clean_path else files)
+    if inline:
+        files += ('-',)  # read from stdin
+    options = shlex.split(options) if isinstance(options, str) else list(options)
+    run_command = command(files, options + ['--mode=gringo'], nb_model=None,
+                          constants=constants, stats=False,
+                          clingo_bin_path=clingo_bin_path)
+    # a file, so gringo is never blocked by a full stderr pipe
+    stderr = tempfile.TemporaryFile()
+    gringo = subprocess.Popen(
+        run_command,
+        stdin=subprocess.PIPE if inline else subprocess.DEVNULL,
+        stdout=stdout,
+        stderr=stderr,
+    )
+    if inline:
+        gringo.stdin.write(inline.encode())
+        gringo.stdin.close()
+    return gringo, stderr
+
+
+def _gringo_stderr(gringo:subprocess.Popen, stderr:object) -> iter:
+    """Wait for given gringo process, then yield its stderr lines"""
+    gringo.wait()
+    stderr.seek(0)
+    for line in stderr:
+        yield line.decode()
+    stderr.close()
+
+
+def ground_to_file(filename:str, files:iter=(), inline:str=None,
+                   options:iter=(), constants:dict={}, clean_path:bool=True,
+                   clingo_bin_path:str=None, error_on_warning:bool=False) -> str:
+    """Write the grounded program directly in given file, without loading it
+    in memory, and return the filename. The file can then be given
+    to solve_from_grounded_file."""
+    with open(filename, 'wb') as fd:
+        gringo, stderr = _run_gringo(files, inline, options, constants,
+                                     clean_path, clingo_bin_path, stdout=fd)
+        raise_on_stderr(_gringo_stderr(gringo, stderr), error_on_warning)
+    return filename
+
+
+def solve_from_grounded_file(filename:str, **kwargs_to_solver):
+    """Solve the grounded program written in given file,
+    for instance by ground_to_file"""
+    options = kwargs_to_solver.get('options', '')
+    options = shlex.split(options) if isinstance(options, str) else list(options)
+    kwargs_to_solver['options'] = options + ['--mode=clasp']
+    kwargs_to_solver['use_clingo_module'] = False
+    return solve(files=(filename,), **kwargs_to_solver)
+
+
+def ground_and_solve(files:iter=(), inline:str=None, options:iter=(),
+                     grounded_file:str=None, nb_model:int=0, time_limit:int=0,
+                     constants:dict={}, clean_path:bool=True, stats:bool=True,
+                     clingo_bin_path:str=None, error_on_warning:bool=False,
+                     decoders:iter=(), output_format:str='text') -> Answers:
+    """Ground then solve given program, streaming the grounded program
+    from the grounder to the solver, without loading it in memory.
+
+    grounded_file -- if given, the grounded program is written in this file,
+                     which is kept for later reuse with solve_from_grounded_file.
+                     Otherwise, grounder output is directly piped to the solver.
+
+    Other arguments are the same as for solve, options being given to both
+    grounder and solver, and constants to the grounder only.
+
+    """
+    if grounded_file:
+        ground_to_file(grounded_file, files, inline, options, constants,
+                       clean_path, clingo_bin_path, error_on_warning)
+        return solve_from_grounded_file(
+            grounded_file, options=options, nb_model=nb_model,
+            time_limit=time_limit, stats=stats, clingo_bin_path=clingo_bin_path,
+            error_on_warning=error_on_warning, decoders=decoders,
+            output_format=output_format
+        )
+    gringo, gringo_stderr = _run_gringo(files, inline, options, constants,
+                                        clean_path, clingo_bin_path,
+                                        stdout=subprocess.PIPE)
+    options = shlex.split(options) if isinstance(options, str) else list(options)
+    run_command = command((), options + ['--mode=clasp'], nb_model=nb_model,
+                          time_limit=time_limit, stats=stats,
+                          clingo_bin_path=clingo_bin_path,
+                          output_format=output_format)
+    clasp = subprocess.Popen(
+        run_command,
+        stdin=gringo.stdout,
+        stdout=subprocess.PIPE,
+        stderr=subprocess.PIPE,
+    )
+    gringo.stdout.close()  # the solver is now the only reader
+    stdout = (line.decode() for line in clasp.stdout)
+    def stderr():  # grounding errors are the relevant ones
+        yield from _gringo_stderr(gringo, gringo_stderr)
+        for line in clasp.stderr:
+            yield line.decode()
+    statistics = {}
+    specific_statuses = {
+        'unsat': False,
+        'unknown': False,
+    }
+    on_end = lambda: (clasp.stderr.close(), clasp.stdout.close(), clasp.wait(),
+                      gringo.wait(), gringo_stderr.close())
+    answers = _gen_answers(stdout, stderr(), statistics, specific_statuses,
+                           error_on_warning, output_format=output_format)
+    return Answers(answers,
+                   command=' '.join(gringo.args) + ' | ' + ' '.join(run_command),
+                   on_end=on_end, decoders=decoders, statistics=statistics,
+                   specific_statuses=specific_statuses, with_optimization=True)
+
+
+def as_grounding_cache(ground_cache:object) -> object or None:
+    """Return the GroundingCache described by given value,
+    or None if no cache is to be used"""
+    if ground_cache is None or ground_cache is False:
+        return None
+    if ground_cache is True:
+        return GroundingCache()
+    if isinstance(ground_cache, str):
+        return GroundingCache(ground_cache)
+    return ground_cache
+
+
+@functools.lru_cache(maxsize=8)
+def _clingo_version_string(clingo_bin_path:str=None) -> str:
+    """Return the version of clingo binary, computed once per binary"""
+    return str(sorted(clingo_version(clingo_bin_path, from_binary=True).items()))
+
+
+REG_INCLUDE = re.compile(rb'#include\s*"([^"]+)"\s*\.')
+
+
+def _included_files(source:bytes, directory:str) -> iter:
+    """Yield paths of files included in given source code with
+    #include "file", relative to given directory or to working directory"""
+    for match in REG_INCLUDE.finditer(source):
+        path = os.fsdecode(match.group(1))
+        relative = os.path.join(directory, path)
+        yield relative if os.path.exists(relative) else path
+
+
+class GroundingCache:
+    """Content-addressed on-disk cache of grounded programs.
+
+    Keys are built from file contents, including the files they include
+    with #include "file", inline code, options, constants and clingo version.
+    Library includes (#include <lib>) are not part of the key.
+    When the cache exceeds its size, the least recently used groundings
+    are removed.
+
+    """
+    DEFAULT_DIRECTORY = os.path.join(
+        os.environ.get('XDG_CACHE_HOME') or os.path.join(os.path.expanduser('~'), '.cache'),
+        'clyngor', 'grounding'
+    )
+    EXTENSION = '.aspif'
+
+    def __init__(self, directory:str=None, max_size:int=2**30):
+        """
+        directory -- directory where groundings are stored
+        max_size -- maximal total size of stored groundings, in bytes
+
+        """
+        self.directory = directory or self.DEFAULT_DIRECTORY
+        self.max_size = int(max_size)
+        os.makedirs(self.directory, exist_ok=True)
+
+
+    def key(self, files:iter, inline:str, options:iter, constants:dict,
+            clingo_bin_path:str=None) -> str:
+        """Return the key identifying the grounding of given input"""
+        digest = hashlib.sha256()
+        def feed(data:bytes):
+            digest.update(str(len(data)).encode() + b':' + data)
+        feed(_clingo_version_string(clingo_bin_path).encode())
+        seen = set()  # included files are fed once
+        def feed_file(file:str):
+            if os.path.abspath(file) in seen:
+                return
+            seen.add(os.path.abspath(file))
+            try:
+                with open(file, 'rb') as fd:
+                    source = fd.read()
+            except FileNotFoundError:  # error will be raised by the grounder
+                source = b''
+            feed(source)
+            for included in _included_files(source, os.path.dirname(file)):
+                feed_file(included)
+        for file in files:
+            feed_file(file)
+        inline = (inline or '').encode()
+        feed(inline)
+        for included in _included_files(inline, '.'):
+            feed_file(included)
+        feed(' '.join(options).encode())
+        feed(repr(sorted((str(k), str(v)) for k, v in constants.items())).encode())
+        return digest.hexdigest()
+
+    def path(self, key:str) -> str:
+        return os.path.join(self.directory, key + self.EXTENSION)
+
+    def __contains__(self, key:str) -> bool:
+        return os.path.exists(self.path(key))
+
+
+    def get(self, key:str) -> str or None:
+        """Return the grounding of given key, or None if not in cache"""
+        path = self.path(key)
+        try:
+            with open(path) as fd:
+                grounded = fd.read()
+        except FileNotFoundError:
+            return None
+        try:  # mark as recently used
+            os.utime(path)
+        except FileNotFoundError:  # removed by a concurrent eviction
+            pass
+        return grounded
+
+    def put(self, key:str, grounded:str):
+        """Store given grounding under given key, then evict
+        least recently used groundings if necessary"""
+        with tempfile.NamedTemporaryFile('w', dir=self.directory, delete=False,
+                                         suffix='.tmp') as fd:
+            fd.write(grounded)
+        os.replace(fd.name, self.path(key))  # atomic for concurrent readers
+        self.evict()
+
+    def evict(self):
+        """Remove least recently used groundings until cache size
+        is below max_size"""
+        entries = []
+        for entry in os.scandir(self.directory):
+            if entry.name.endswith(self.EXTENSION):
+                try:
+                    stat = entry.stat()
+                except FileNotFoundError:
+                    continue
+                entries.append((stat.st_mtime, stat.st_size, entry.path))
+        total = sum(size for _, size, _ in entries)
+        for _, size, path in sorted(entries):
+            if total <= self.max_size:
+                break
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
+            total -= size
+
+    def clear(self):
+        """Remove all groundings"""
+        for entry in os.scandir(self.directory):
+            if entry.name.endswith(self.EXTENSION):
+                os.remove(entry.path)
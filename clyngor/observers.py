@@ -0,0 +1,194 @@
+"""Observers of the grounding process, to be given to solve
+through its grounding_observers argument, to Session through its observers
+argument, or to clingo.Control.register_observer.
+
+Usage:
+
+    observer = GroundProgramObserver()
+    answers = clyngor.solve('encoding.lp', grounding_observers=[observer])
+    print(observer.statistics)
+    for rule in observer.rules_defining('p(1)'):
+        print(observer.rule_as_text(rule))
+
+"""
+
+from array import array
+from collections import namedtuple, Counter
+from clyngor import utils
+
+
+CHOICE, WEIGHT = 1, 2  # flags of rules
+
+# head and body are tuples of program literals, negative ones being
+# default negated. Bodies of weight rules are pairs (literal, weight),
+# and lower_bound is None for normal rules.
+GroundRule = namedtuple('GroundRule', 'index choice head body lower_bound')
+
+
+class GroundProgramObserver:
+    """Collect the ground rules, weight rules and output atoms of a program,
+    literals being stored in arrays of 32 bits integers.
+
+    Atoms are identified by program literals, mapped to their symbol
+    through the output atoms, i.e. the shown ones. Other atoms can be
+    named with add_symbolic_atoms, once the program is grounded.
+
+    """
+
+    def __init__(self):
+        self._flags = array('b')  # CHOICE and WEIGHT flags of each rule
+        self._bounds = array('i')  # lower bound of each rule, 0 for normal rules
+        self._head_offsets = array('q', [0])  # rule i heads are _heads[offsets[i]:offsets[i+1]]
+        self._heads = array('i')
+        self._body_offsets = array('q', [0])
+        self._bodies = array('i')
+        self._weights = array('i')  # weight of each body literal, 1 for normal rules
+        self._symbols = {}  # program atom -> clingo.Symbol
+        self._atoms = {}  # clingo.Symbol -> program atom
+        self.facts = []  # shown symbols known to be true after grounding
+        self._defining = None  # program atom -> rule indexes, built when needed
+
+
+    def rule(self, choice:bool, head:iter, body:iter):
+        """Observer callback for normal and choice rules"""
+        self._add_rule(CHOICE if choice else 0, 0, head, body, ())
+
+    def weight_rule(self, choice:bool, head:iter, lower_bound:int, body:iter):
+        """Observer callback for weight rules, body being (literal, weight) pairs"""
+        self._add_rule((CHOICE if choice else 0) | WEIGHT, lower_bound, head,
+                       (lit for lit, _ in body), (weight for _, weight in body))
+
+    def output_atom(self, symbol:object, atom:int):
+        """Observer callback for shown atoms, atom 0 denoting a fact"""
+        if atom == 0:
+            self.facts.append(symbol)
+        else:
+            self._symbols[atom] = symbol
+            self._atoms[symbol] = atom
+
+    def _add_rule(self, flags:int, bound:int, head:iter, body:iter, weights:iter):
+        self._flags.append(flags)
+        self._bounds.append(bound)
+        self._heads.extend(head)
+        self._head_offsets.append(len(self._heads))
+        nb_body = len(self._bodies)
+        self._bodies.extend(body)
+        self._body_offsets.append(len(self._bodies))
+        if flags & WEIGHT:
+            self._weights.extend(weights)
+        else:
+            self._weights.extend(array('i', (1,)) * (len(self._bodies) - nb_body))
+        self._defining = None
+
+
+    def add_symbolic_atoms(self, symbolic_atoms:iter) -> 'GroundProgramObserver':
+        """Name the atoms not shown, using given clingo.SymbolicAtoms,
+        for instance Session.control.symbolic_atoms"""
+        for atom in symbolic_atoms:
+            self._symbols.setdefault(atom.literal, atom.symbol)
+            self._atoms.setdefault(atom.symbol, atom.literal)
+        return self
+
+    def atom(self, value:object) -> int or None:
+        """Return the program atom of given clingo.Symbol, ASP string
+        or atom as represented by clyngor, or None if unknown"""
+        return self._atoms.get(utils.as_clingo_symbol(value))
+
+    def symbol(self, literal:int) -> object or None:
+        """Return the clingo.Symbol of given program literal, or None if unknown"""
+        return self._symbols.get(abs(literal))
+
+
+    def __len__(self) -> int:
+        return len(self._flags)
+
+    def __getitem__(self, index:int) -> GroundRule:
+        """Return the rule of given index"""
+        index = range(len(self))[index]  # handle negative indexes and bounds
+        flags = self._flags[index]
+        head = tuple(self._heads[self._head_offsets[index]:self._head_offsets[index+1]])
+        start, stop = self._body_offsets[index], self._body_offsets[index+1]
+        body = tuple(self._bodies[start:stop])
+        if flags & WEIGHT:
+            body = tuple(zip(body, self._weights[start:stop]))
+        return GroundRule(index, bool(flags & CHOICE), head, body,
+                          self._bounds[index] if flags & WEIGHT else None)
+
+    def __iter__(self):
+        """Yield all rules"""
+        for index in range(len(self)):
+            yield self[index]
+
+    def rules_defining(self, value:object) -> [GroundRule]:
+        """Return the rules having given atom in their head, atom being
+        a program atom, or anything accepted by self.atom"""
+        atom = value if isinstance(value, int) else self.atom(value)
+        if atom is None:
+            return []
+        if self._defining is None:
+            self._defining = self._build_defining_index()
+        return [self[index] for index in self._defining.get(atom, ())]
+
+    def _build_defining_index(self) -> dict:
+        defining = {}  # program atom -> rule indexes
+        offsets, heads = self._head_offsets, self._heads
+        for index in range(len(self)):
+            for pos in range(offsets[index], offsets[index+1]):
+                defining.setdefault(heads[pos], array('i')).append(index)
+        return defining
+
+
+    def rules_by_predicate(self) -> Counter:
+        """Return the number of rules defining atoms of each predicate,
+        as a Counter of (name, arity), or None for unnamed atoms.
+        A rule is counted once for each atom in its head."""
+        symbols = self._symbols
+        counts = Counter()
+        for atom in self._heads:
+            symbol = symbols.get(atom)
+            counts[None if symbol is None else (symbol.name, len(symbol.arguments))] += 1
+        return counts
+
+    @property
+    def statistics(self) -> dict:
+        """Size of the collected ground program"""
+        flags = self._flags
+        tables = (flags, self._bounds, self._head_offsets, self._heads,
+                  self._body_offsets, self._bodies, self._weights)
+        return {
+            'rules': len(flags),
+            'choice rules': sum(1 for flag in flags if flag & CHOICE),
+            'weight rules': sum(1 for flag in flags if flag & WEIGHT),
+            'constraints': sum(1 for index in range(len(flags))
+                               if self._head_offsets[index] == self._head_offsets[index+1]
+                               and not flags[index] & CHOICE),
+            'head literals': len(self._heads),
+            'body literals': len(self._bodies),
+            'atoms': max(map(abs, self._heads + self._bodies), default=0),
+            'named atoms': len(self._symbols),
+            'facts': len(self.facts),
+            'bytes': sum(table.itemsize * len(table) for table in tables),
+        }
+
+
+    def rule_as_text(self, rule:GroundRule or int) -> str:
+        """Return given rule, or rule of given index, in ASP syntax,
+        atoms without symbol being written as #atom(N)"""
+        rule = self[rule] if isinstance(rule, int) else rule
+        def lit_text(lit:int) -> str:
+            symbol = self.symbol(lit)
+            text = '#atom({})'.format(abs(lit)) if symbol is None else str(symbol)
+            return text if lit > 0 else 'not ' + text
+        head = ';'.join(map(lit_text, rule.head))
+        if rule.choice:
+            head = '{' + head + '}'
+        if rule.lower_bound is None:
+            body = ', '.join(map(lit_text, rule.body))
+        else:
+            body = '#sum {{ {} }} >= {}'.format('; '.join(
+                '{},{}: {}'.format(weight, idx, lit_text(lit))
+                for idx, (lit, weight) in enumerate(rule.body)
+            ), rule.lower_bound)
+        if not body:
+            return head + '.'
+        return (head + ' :- ' if head else ':- ') + body + '.'
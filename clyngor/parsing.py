@@ -2,6 +2,9 @@
 
 """
 import re
+import json
+import threading
+from functools import lru_cache
 
 
 import arpeggio as ap
@@ -86,6 +89,145 @@ class CollapsableAtomVisitor(ap.PTNodeVisitor):
         return terms
 
 
+class AtomTokenizer:
+    """Hand-written single-pass recursive descent parser of answer sets,
+    producing the same frozensets as CollapsableAtomVisitor with same options,
+    without building any parse tree.
+
+    Any input that is not a whole valid sequence of terms raises a ValueError,
+    so the caller can fall back to the arpeggio parser, that handles these
+    cases (by silently ignoring the unparsable end of the answer set).
+
+    >>> AtomTokenizer().parse_terms('a(b,c(d))')
+    frozenset({('a', ('b', 'c(d)'))})
+    >>> AtomTokenizer().parse_terms('a(X)')  # doctest: +IGNORE_EXCEPTION_DETAIL
+    Traceback (most recent call last):
+    ...
+    ValueError
+
+    """
+    WS = frozenset(ap.DEFAULT_WS)
+    REG_IDENT = re.compile(r'[a-z_-][a-zA-Z0-9_]*')
+    REG_NUMBER = re.compile(r'-?[0-9]+')
+    REG_TEXT = re.compile(r'(?:\\"|[^"])*')
+
+    def __init__(self, collapse_args:bool=True, collapse_atoms:bool=False,
+                 discard_quotes:bool=False, first_arg_only:bool=False, parse_integer:bool=True):
+        self.collapse_args = bool(collapse_args)
+        self.collapse_atoms = bool(collapse_atoms)
+        self._int_builder = int if parse_integer else str
+        self.discard_quotes = bool(discard_quotes)
+        self.first_arg_only = bool(first_arg_only)
+
+    def parse_terms(self, string:str) -> frozenset:
+        """Return the frozenset computed from given valid ASP-compliant string,
+        or raise ValueError"""
+        terms = []
+        pos = self._skip_ws(string, 0)
+        end = len(string)
+        while pos < end:
+            term, pos = self._term(string, pos)
+            terms.append(term)
+            pos = self._skip_ws(string, pos)
+        return frozenset(terms)
+
+    # alias
+    parse = parse_terms
+
+
+    def _skip_ws(self, string:str, pos:int) -> int:
+        ws, end = self.WS, len(string)
+        while pos < end and string[pos] in ws:
+            pos += 1
+        return pos
+
+    def _expect(self, string:str, pos:int) -> (str, int):
+        """Return the first non-whitespace char starting at pos, and its position"""
+        pos = self._skip_ws(string, pos)
+        if pos >= len(string):
+            raise ValueError("Unexpected end of answer set: " + repr(string))
+        return string[pos], pos
+
+    def _term(self, string:str, pos:int) -> (object, int):
+        if string[pos] == '"':
+            return self._text(string, pos)
+        match = self.REG_NUMBER.match(string, pos)
+        if match:
+            return self._int_builder(match.group()), match.end()
+        match = self.REG_IDENT.match(string, pos)
+        if not match:
+            raise ValueError("Unexpected character at position {} in {}".format(pos, repr(string)))
+        args, pos = self._optional_args(string, match.end())
+        return self._atom(match.group(), args), pos
+
+    def _text(self, string:str, pos:int) -> (str, int):
+        pos = self._skip_ws(string, pos + 1)  # NB: arpeggio skips leading whitespaces
+        end = self.REG_TEXT.match(string, pos).end()
+        if end >= len(string):  # no closing quote
+            raise ValueError("Unterminated string in " + repr(string))
+        text = string[pos:end]
+        return (text if self.discard_quotes else '"' + text + '"'), end + 1
+
+    def _optional_args(self, string:str, pos:int) -> (list or None, int):
+        """Return args between parens if any, or None"""
+        next_pos = self._skip_ws(string, pos)
+        if next_pos >= len(string) or string[next_pos] != '(':
+            return None, pos
+        args, pos = [], next_pos
+        while True:
+            arg, pos = self._subterm(string, pos + 1)
+            args.append(arg)
+            char, pos = self._expect(string, pos)
+            if char == ')':
+                return args, pos + 1
+            elif char != ',':
+                raise ValueError("Unexpected character at position {} in {}".format(pos, repr(string)))
+
+    def _subterm(self, string:str, pos:int) -> (object, int):
+        char, pos = self._expect(string, pos)
+        if char == '"':
+            return self._text(string, pos)
+        elif char == '(':  # single value or tuple
+            first, pos = self._subterm(string, pos + 1)
+            char, pos = self._expect(string, pos)
+            if char == ')':
+                return first, pos + 1
+            elif char != ',':
+                raise ValueError("Unexpected character at position {} in {}".format(pos, repr(string)))
+            if self._expect(string, pos + 1)[0] == ')':  # one-uplet
+                return self._atom('', [first]), self._expect(string, pos + 1)[1] + 1
+            items = [first]
+            while char == ',':
+                item, pos = self._subterm(string, pos + 1)
+                items.append(item)
+                char, pos = self._expect(string, pos)
+            if char != ')':
+                raise ValueError("Unexpected character at position {} in {}".format(pos, repr(string)))
+            return self._atom('', items), pos + 1
+        match = self.REG_NUMBER.match(string, pos)
+        if match:
+            return self._int_builder(match.group()), match.end()
+        match = self.REG_IDENT.match(string, pos)
+        if not match:
+            raise ValueError("Unexpected character at position {} in {}".format(pos, repr(string)))
+        predicate = match.group()
+        args, pos = self._optional_args(string, match.end())
+        if args is None:
+            return predicate, pos
+        elif self.collapse_args:
+            return predicate + '(' + ','.join(map(str, args)) + ')', pos
+        else:
+            return (predicate, tuple(args)), pos
+
+    def _atom(self, predicate:str, args:list or None) -> tuple or str:
+        if self.first_arg_only and args:
+            args = args[:1]
+        if self.collapse_atoms:
+            return (predicate + '(' + ','.join(map(str, args)) + ')') if args else predicate
+        else:
+            return (predicate, (tuple(args) if args else ()))
+
+
 class Parser:
     def __init__(self, collapse_atoms=False, collapse_args=True, discard_quotes:bool=False,
                  first_arg_only:bool=False, callback=None, parse_integer:bool=True):
@@ -138,6 +280,13 @@ class Parser:
             parse_integer
         )
         self.grammar = self.atom_visitor.grammar()
+        self.tokenizer = AtomTokenizer(
+            self.collapse_args,
+            self.collapse_atoms,
+            self.discard_quotes,
+            self.first_arg_only,
+            parse_integer
+        )
         self.callback = callback
         if self.collapse_atoms and not self.collapse_args:
             raise ValueError("if atoms are collapsed, terms must"
@@ -146,7 +295,14 @@ class Parser:
 
     def parse_terms(self, string:str) -> frozenset:
         """Return the frozenset computed from given valid ASP-compliant string"""
-        parse_tree = ap.ParserPython(self.grammar).parse(string)
+        try:
+            return self.tokenizer.parse_terms(string)
+        except ValueError:  # let arpeggio handle the unexpected
+            return self.arpeggio_parse_terms(string)
+
+    def arpeggio_parse_terms(self, string:str) -> frozenset:
+        """Same as parse_terms, but using the reference arpeggio parser"""
+        parse_tree = compiled_grammar().parse(string)
         if parse_tree:
             return ap.visit_parse_tree(parse_tree, self.atom_visitor)
         else:
@@ -172,6 +328,44 @@ class Parser:
                 yield type, payload
 
 
+_compiled_grammars = threading.local()
+
+def compiled_grammar() -> ap.ParserPython:
+    """Return the arpeggio parser of CollapsableAtomVisitor grammar,
+    built once per thread, since it does not depend on parsing options,
+    but keeps the state of the running parsing"""
+    parser = getattr(_compiled_grammars, 'parser', None)
+    if parser is None:
+        parser = _compiled_grammars.parser = ap.ParserPython(CollapsableAtomVisitor.grammar())
+    return parser
+
+
+def cached_parser(collapse_atoms:bool=False, collapse_args:bool=True,
+                  discard_quotes:bool=False, first_arg_only:bool=False,
+                  parse_integer:bool=True) -> Parser:
+    """Return the Parser instance built with given options,
+    shared with all other callers giving the same options,
+    whether they are given by position or keyword.
+
+    Hit rates can be inspected with cached_parser.cache_info().
+
+    >>> cached_parser(parse_integer=False) is cached_parser(True and False, parse_integer=0)
+    True
+
+    """
+    return _cached_parser(bool(collapse_atoms), bool(collapse_args), bool(discard_quotes),
+                          bool(first_arg_only), bool(parse_integer))
+
+@lru_cache(maxsize=64)
+def _cached_parser(*options:(bool,)) -> Parser:
+    """Return the Parser built with given options, keyed on the option tuple"""
+    *options, parse_integer = options
+    return Parser(*options, parse_integer=parse_integer)
+
+cached_parser.cache_info = _cached_parser.cache_info
+cached_parser.cache_clear = _cached_parser.cache_clear
+
+
 def parse_clasp_output(output:iter or str, *, yield_stats:bool=False,
                        yield_opti:bool=True, yield_info:bool=False,
                        yield_prgs:bool=False):
@@ -199,7 +393,9 @@ def parse_clasp_output(output:iter or str, *, yield_stats:bool=False,
     output = iter(output.splitlines() if isinstance(output, str) else output)
 
     # get the first lines
-    line = next(output)
+    line = next(output, None)
+    if line is None:  # no output at all
+        return
     infos = []
     while not line.startswith(ASW_FLAG) and not line.startswith(UNSAT) and not line.startswith(UNKNOWN):
         infos.append(line)
@@ -246,6 +442,73 @@ def parse_clasp_output(output:iter or str, *, yield_stats:bool=False,
 parse_clasp_output.out_types = ('info', 'answers', 'optimization, ''statistics')  # the order is the one in clingo input
 
 
+def parse_clasp_json_output(output:iter or str, *, yield_stats:bool=False,
+                            yield_opti:bool=True, yield_info:bool=False):
+    """Yield pairs (payload type, payload), exactly like parse_clasp_output,
+    but from the JSON output of clingo (option --outf=2).
+
+    Witnesses are yielded as soon as clingo prints them, so the whole
+    output is never held in memory. Statistics are given as found
+    in the JSON document, therefore typed and possibly nested.
+
+    output -- iterable of lines or full clingo JSON output to parse
+    yield_stats -- yields final statistics as a mapping {field: value}
+                   under type 'statistics'
+    yield_opti  -- yields costs of each answer and optimality of the last one
+    yield_info  -- yields solver name and result under type 'info'
+
+    Note that the answer number restarts at each solving call, but,
+    unlike the text output, not at the beginning of the optN enumeration.
+
+    """
+    output = iter(output.splitlines() if isinstance(output, str) else output)
+    document, witness = [], []  # lines of the document without witnesses, lines of current witness
+    in_witnesses = False
+    answer_number = 0
+    for line in output:
+        stripped = line.strip()
+        if in_witnesses:
+            if not witness and stripped in {']', '],'}:
+                in_witnesses = False
+                document.append(line)
+                continue
+            witness.append(line)
+            if stripped not in {'}', '},'}:
+                continue
+            try:
+                payload = json.loads(''.join(witness).rstrip().rstrip(','))
+            except json.JSONDecodeError:  # closing brace of a nested object
+                continue
+            witness = []
+            answer_number += 1
+            yield 'answer_number', answer_number
+            yield 'answer', ' '.join(payload.get('Value', ()))
+            if yield_opti and 'Costs' in payload:
+                yield 'optimization', tuple(payload['Costs'])
+        else:
+            document.append(line)
+            if stripped == '"Witnesses": [':
+                in_witnesses, answer_number = True, 0
+
+    try:
+        document = json.loads('\n'.join(document))
+    except json.JSONDecodeError:  # clingo failed to output a complete document
+        return
+    result = document.get('Result')
+    if result == 'OPTIMUM FOUND' and yield_opti:
+        yield 'optimum found', True
+    elif result == 'UNSATISFIABLE':
+        yield 'unsat', True
+    elif result == 'UNKNOWN':
+        yield 'unknown', True
+    if yield_stats:
+        yield 'statistics', {field: value for field, value in document.items()
+                             if field not in {'Solver', 'Input', 'Call', 'Result'}}
+    if yield_info:
+        yield 'info', tuple(str(document[field]) for field in ('Solver', 'Result')
+                            if field in document)
+
+
 def validate_clasp_stderr(stderr:iter or str) -> iter:
     """Parse stderr of clingo, detect and yield defects lines in form of dict"""
     reg_err = re.compile(r'(.+):([0-9]+):([0-9]+)-([0-9]+): (\w+): (.+)')
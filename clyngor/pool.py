@@ -0,0 +1,147 @@
+"""Definition of the SolverPool, dispatching many small solving jobs
+to a bounded set of worker processes running the clingo module.
+
+"""
+
+import time
+import shlex
+import threading
+import multiprocessing
+import clyngor
+from clyngor import utils
+from clyngor.answers import Answers
+
+
+def _init_worker():
+    """Import clingo once per worker, so jobs are run on a warm module"""
+    import clingo
+
+
+def _solve_job(files:tuple, inline:str, options:list, nb_model:int,
+               programs:list) -> (list, dict, dict, float):
+    """Run the solving in a worker process, and return the models
+    as 4-uplets (answer set, optimization, optimality, answer number),
+    the statistics, the unsat and unknown statuses and the time spent"""
+    import clingo
+    from clyngor.solving import raise_on_stderr
+    start = time.perf_counter()
+    messages = []  # lines logged by clingo, as it would write them in stderr
+    ctl = clingo.Control(options, logger=lambda code, msg: messages.extend(msg.splitlines()))
+    try:
+        for file in files:
+            ctl.load(file)
+        if inline:
+            ctl.add('base', [], inline)
+        ctl.ground([(prg, [utils.as_clingo_symbol(arg) for arg in args])
+                    for prg, args in programs])
+    except RuntimeError:  # raise ASPSyntaxError, as solve does
+        raise_on_stderr(iter(messages))
+        raise
+    ctl.configuration.solve.models = nb_model
+    models = []
+    with ctl.solve(yield_=True) as handle:
+        for model in handle:
+            answer_set = tuple(utils.clingo_symbol_as_python_value(atom)
+                               for atom in model.symbols(shown=True))
+            models.append((answer_set, model.cost, model.optimality_proven, model.number))
+        result = handle.get()
+    statuses = {'unsat': bool(result.unsatisfiable), 'unknown': bool(result.unknown)}
+    return models, ctl.statistics, statuses, time.perf_counter() - start
+
+
+class SolverPool:
+    """Pool of worker processes running the clingo module, avoiding
+    the cost of a clingo process spawning for each solving.
+
+    Solving is blocking, but thread-safe: concurrent calls are dispatched
+    to at most max_workers workers, others are waiting for a free one.
+
+        with SolverPool(max_workers=4) as pool:
+            for answer in pool.solve(inline='a;b.').by_predicate:
+                ...
+
+    """
+
+    def __init__(self, max_workers:int=None, max_jobs_per_worker:int=None,
+                 options:iter=()):
+        """
+        max_workers -- number of worker processes (default: number of CPUs)
+        max_jobs_per_worker -- number of jobs after which a worker is replaced
+                               by a new one (default: never)
+        options -- string or iterable of options for clingo, used by all jobs
+
+        """
+        if not clyngor.clingo_module_available:
+            raise RuntimeError("SolverPool requires the clingo module, which is not available.")
+        self._options = list(shlex.split(options) if isinstance(options, str) else options)
+        self._pool = multiprocessing.Pool(max_workers, initializer=_init_worker,
+                                          maxtasksperchild=max_jobs_per_worker)
+        self._lock = threading.Lock()
+        self._start = time.time()
+        self._counters = {'jobs': 0, 'completed': 0, 'failed': 0,
+                          'models': 0, 'solving time': 0.}
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *_):
+        self.close()
+
+    def close(self):
+        """Wait for running jobs, and stop the workers"""
+        self._pool.close()
+        self._pool.join()
+
+
+    def solve(self, files:iter=(), inline:str=None, options:iter=(),
+              nb_model:int=0, constants:dict={},
+              programs:iter=(['base', ()],)) -> Answers:
+        """Return an Answers instance yielding the answer sets found
+        by a worker on given files and inline code.
+
+        files -- iterable of files feeding the solver
+        inline -- ASP source code to feed the solver with
+        options -- string or iterable of options for clingo,
+                   added to the options given to the pool
+        nb_model -- number of model to output (0 for all (default))
+        constants -- mapping name -> value of constants for the grounding
+        programs -- programs to ground, with their arguments,
+                    as python values or ASP strings
+
+        Syntax errors are raised as ASPSyntaxError, like solve does
+        with the clingo binary.
+
+        """
+        files = [files] if isinstance(files, str) else files
+        files = tuple(map(utils.cleaned_path, files))
+        options = self._options + list(shlex.split(options) if isinstance(options, str) else options)
+        for name, value in constants.items():
+            options += ['-c', '{}={}'.format(name, value)]
+        programs = [(prg, list(args)) for prg, args in programs]
+        with self._lock:
+            self._counters['jobs'] += 1
+        try:
+            models, statistics, statuses, elapsed = self._pool.apply(
+                _solve_job, (files, inline, options, nb_model or 0, programs))
+        except Exception:
+            with self._lock:
+                self._counters['failed'] += 1
+            raise
+        with self._lock:
+            self._counters['completed'] += 1
+            self._counters['models'] += len(models)
+            self._counters['solving time'] += elapsed
+        return Answers(models, command='[solver pool call]', statistics=statistics,
+                       specific_statuses=statuses, with_optimization=True)
+
+
+    @property
+    def counters(self) -> dict:
+        """Number of jobs submitted, completed and failed, number of models found,
+        time spent by workers in solving, and completed jobs per second
+        since pool creation"""
+        with self._lock:
+            counters = dict(self._counters)
+        counters['uptime'] = time.time() - self._start
+        counters['throughput'] = counters['completed'] / counters['uptime']
+        return counters
@@ -4,17 +4,17 @@ Exposes Main, Constraint and Variable.
 
 """
 
-import os
 import math
-import tempfile
 from collections import defaultdict
+from collections.abc import Mapping
 from . import utils
 from .answers import ClingoAnswers
 
 
-def Main(files:iter=(), inline:str='', nb_model:int=0,
+def Main(files:iter=(), inline:str or iter='', nb_model:int=0,
          propagators:iter or object=(), observers:iter or object=(),
-         programs:iter or dict={'base': ()}, generator:bool=False):
+         programs:iter or dict={'base': ()}, generator:bool=False,
+         assumptions:iter=(), time_limit:float=0, threads:int=None):
     """Main function builder for clingo.
 
     Allow user to use:
@@ -34,10 +34,15 @@ def Main(files:iter=(), inline:str='', nb_model:int=0,
     observers -- observers instances to register (default none)
     programs -- programs with their args to ground (default base without param)
     files -- list of files to ground
-    inline -- ASP code to add to base program
+    inline -- ASP code to add to base program, or iterable of them
     generator -- the main function will return a ClingoAnswers instance instead
                  of returning the solve call result
     nb_model -- number of model to search for. 0 stands for all.
+    assumptions -- atoms assumed true, or pairs (atom, truth value),
+                   converted to literals once the program is grounded.
+    time_limit -- zero or number of seconds after which solving is canceled.
+    threads -- number of solver threads (default: as configured).
+               Propagators get their own state for each thread.
 
     """
     if not isinstance(propagators, (tuple, list, set, frozenset)):
@@ -49,28 +54,35 @@ def Main(files:iter=(), inline:str='', nb_model:int=0,
         (prg, list(args)) for prg, args
         in (programs.items() if isinstance(programs, dict) else programs)
     )
-    if inline:
-        with tempfile.NamedTemporaryFile(mode='w', delete=False) as fd:
-            fd.write(inline)
-            tempfile_to_del = fd.name
-            files = tuple(files) + (tempfile_to_del,)
-            assert files, fd.name
+    inline = (inline,) if isinstance(inline, str) else tuple(inline)
 
     def main(prg):
+        if threads:
+            prg.configuration.solve.parallel_mode = str(threads)
         for file in files:
             prg.load(file)
-        if inline and tempfile_to_del:  # remove the tempfile after the work.
-            os.remove(tempfile_to_del)
+        for chunk in inline:
+            if chunk:
+                prg.add('base', [], chunk)
         for observer in observers:
             prg.register_observer(observer)
         for propagator in propagators:
             prg.register_propagator(propagator)
         prg.ground(programs)
         prg.configuration.solve.models = nb_model
+        literals = ()
+        if assumptions:
+            index = utils.symbolic_atoms_index(prg.symbolic_atoms)
+            literals = utils.assumptions_as_literals(assumptions, index)
         if generator:
-            return ClingoAnswers(prg)  # will take care of solving by itself
+            # will take care of solving by itself
+            return ClingoAnswers(prg, assumptions=literals, time_limit=time_limit)
+        elif time_limit:
+            with prg.solve(assumptions=literals, async_=True) as handle:
+                if not handle.wait(time_limit):
+                    handle.cancel()
         else:
-            prg.solve()
+            prg.solve(assumptions=literals)
     return main
 
 
@@ -90,64 +102,118 @@ class Propagator:
                                         if isinstance(fol, str))
         self._raw_followeds = frozenset(fol for fol in self._followeds
                                         if not isinstance(fol, str))
-        self.__discarding_model = False
+        # predicates followed whatever their arity
+        self._any_arity_followeds = frozenset(fol[0] for fol in self._raw_followeds
+                                              if len(fol) == 1)
+        # (predicate, arity) -> {positions of non-Variable arguments: set of their values}
+        self._raw_index = {}
+        for fol in self._raw_followeds:
+            if len(fol) != 2: continue
+            pred, params = fol
+            fixed = tuple(idx for idx, param in enumerate(params) if param is not Variable)
+            self._raw_index.setdefault((pred, len(params)), {}).setdefault(fixed, set()).add(
+                tuple(params[idx] for idx in fixed)
+            )
 
 
     def init(self, init):
         self.symbols = defaultdict(set)
+        self._literals = {}  # followed atom -> watched literal
+        # solver threads are working on their own assignment
+        self._states = [_ThreadState(self._literals) for _ in range(init.number_of_threads)]
         if not self._followeds: return
-        for atom in init.symbolic_atoms:
-            lit = init.solver_literal(atom.literal)
-            repr_str = str(atom.symbol)
-            if self._match_str(repr_str):
-                init.add_watch(lit)
+        import clingo
+        symbolic_atoms = init.symbolic_atoms
+        watched_by_str = set()  # string inputs take precedence over raws
+        for repr_str in self._str_followeds:
+            try:
+                atom = symbolic_atoms[clingo.parse_term(repr_str)]
+            except RuntimeError:  # not a valid term, so not an atom
+                continue
+            if atom is not None:
+                lit = init.solver_literal(atom.literal)
                 self.symbols[lit].add(repr_str)
-            else:  # not in string inputs, maybe in raws ?
-                repr = atom.symbol.name, tuple(map(utils.clingo_value_to_python,
-                                                   atom.symbol.arguments))
+                watched_by_str.add(atom.symbol)
+        # only atoms of followed predicates are considered
+        for name, arity, positive in symbolic_atoms.signatures:
+            if name not in self._any_arity_followeds and (name, arity) not in self._raw_index:
+                continue
+            for atom in symbolic_atoms.by_signature(name, arity, positive):
+                symbol = atom.symbol
+                if symbol in watched_by_str: continue
+                repr = name, utils.clingo_value_to_python(symbol.arguments)
                 if self._match_raw(*repr):
-                    init.add_watch(lit)
+                    lit = init.solver_literal(atom.literal)
                     self.symbols[lit].add(repr)
+        for lit, reprs in self.symbols.items():
+            init.add_watch(lit)  # both polarities, to get all assignments
+            init.add_watch(-lit)
+            self._literals.update((repr, lit) for repr in reprs)
 
 
     def propagate(self, ctl, changes):
-        if self.__discarding_model:
+        state = self._states[ctl.thread_id]
+        assigned, symbols = state.assigned, self.symbols
+        for lit in changes:  # lit is now true, so -lit is now false
+            if lit in symbols:
+                assigned[lit] = True
+            if -lit in symbols:
+                assigned[-lit] = False
+        if state.discarding_model:
             # propagation during model discarding
             return
-        value_of = ctl.assignment.value
-        values = {
-            repr: value_of(lit)
-            for lit, reprs in self.symbols.items()
-            for repr in reprs
-        }
-        complete = all(value is not None for value in values.values())
-        partial = any(value is not None for value in values.values())
+        values = state.values
+        complete = len(assigned) == len(symbols)
+        partial = bool(assigned)
         if complete and hasattr(self, 'on_all_input'):
-            discard = self.on_all_input(values)
+            violation = self.on_all_input(values)
         elif partial and hasattr(self, 'on_any_input'):
-            discard = self.on_any_input(values)
+            violation = self.on_any_input(values)
         else:
             return
 
-        if discard:
-            self.__discard_model(ctl, use_lit=next(iter(changes)))
-
-
-    def __discard_model(self, ctl, use_lit):
-        """Make the current model false by adding a clause
-        """
-        # make it true, then false.
-        self.__discarding_model = True
-        add_clause_failure = not ctl.add_nogood([use_lit], tag=True, lock=True)
-        if add_clause_failure:
-            # print('STATE:', add_clause_failure)
-            self.__discarding_model = False
-            return
-        propagation_failure = not ctl.propagate()
-        self.__discarding_model = False
-        # print('STATE:', add_clause_failure, propagation_failure)
-        if add_clause_failure or propagation_failure:
-            return
+        if violation:
+            self.__add_nogood(ctl, state, self._nogood(violation, state.assigned))
+
+
+    def undo(self, thread_id, assignment, changes):
+        assigned, symbols = self._states[thread_id].assigned, self.symbols
+        for lit in changes:
+            if lit in symbols:
+                del assigned[lit]
+            if -lit in symbols:
+                del assigned[-lit]
+
+
+    def _nogood(self, violation:bool or object or iter, assigned:dict) -> [int]:
+        """Return the nogood forbidding the current values of the atoms
+        responsible of given violation, as returned by on_all_input
+        or on_any_input: True if all assigned inputs are responsible,
+        an atom (string or tuple), or a set or list of atoms."""
+        literals = self._literals
+        if isinstance(violation, (str, tuple)):  # a single atom
+            violation = (violation,)
+        if not isinstance(violation, (set, frozenset, list, tuple)):  # True
+            lits = assigned
+        else:
+            atoms = violation
+            lits = []
+            for atom in atoms:
+                lit = literals[atom]
+                if lit not in assigned:
+                    raise ValueError("Atom {} is given as responsible of a violation, "
+                                     "but is not assigned.".format(atom))
+                lits.append(lit)
+        return sorted({lit if assigned[lit] else -lit for lit in lits})
+
+
+    def __add_nogood(self, ctl, state:'_ThreadState', nogood:[int]):
+        """Forbid the current values of the literals of given nogood"""
+        state.discarding_model = True
+        if ctl.add_nogood(nogood, tag=True, lock=True):
+            ctl.propagate()
+        # else: conflict, the solver will backtrack
+        state.discarding_model = False
 
 
     def _match_str(self, atom:str) -> bool:
@@ -156,27 +222,65 @@ class Propagator:
             return True
 
     def _match_raw(self, name:str, args:tuple) -> bool:
-        """True if given atom is in inputs"""
-        if (name, args) in self._raw_followeds or (name,) in self._raw_followeds:
+        """True if given atom is in inputs, Variable matching any argument
+
+        >>> prop = Propagator(follow=[('p', (1, Variable)), ('q',)])
+        >>> prop._match_raw('p', (1, 2)), prop._match_raw('p', (2, 1)), prop._match_raw('p', (1,))
+        (True, False, False)
+        >>> prop._match_raw('q', ()), prop._match_raw('q', ('a', 'b'))
+        (True, True)
+
+        """
+        if name in self._any_arity_followeds:
             return True
-        # more complex verification: it may be because of variables
-        for atom in self._raw_followeds:
-            if len(atom) != 2: continue
-            pred, params = atom
-            if pred == name and len(args) == len(params):
-                for arg, param in zip(args, params):
-                    if param is Variable or arg == param:
-                        return True
+        for fixed, values in self._raw_index.get((name, len(args)), {}).items():
+            if tuple(args[idx] for idx in fixed) in values:
+                return True
+        return False
 
 
     def run_with(self, filenames:[str]=(), inline:str='',
-                 programs:iter=(['base', ()],), options:list=[]):
+                 programs:iter=(['base', ()],), options:list=[],
+                 assumptions:iter=(), threads:int=None):
         import clingo
         ctl = clingo.Control(options)
-        main = Main(propagators=self, programs=programs, inline=inline, generator=True)
+        main = Main(filenames, propagators=self, programs=programs, inline=inline,
+                    generator=True, assumptions=assumptions, threads=threads)
         return main(ctl)
 
 
+class _ThreadState:
+    """Assignment of the followed literals, as seen by a solver thread"""
+    __slots__ = ('assigned', 'values', 'discarding_model')
+
+    def __init__(self, literals:dict):
+        self.assigned = {}  # watched literal -> its value, if assigned
+        self.values = _InputValues(literals, self.assigned)
+        self.discarding_model = False
+
+
+class _InputValues(Mapping):
+    """Read-only view on the values of followed atoms, True, False
+    or None if not assigned, following the solver assignment"""
+    __slots__ = ('_literals', '_assigned')
+
+    def __init__(self, literals:dict, assigned:dict):
+        self._literals = literals  # atom -> watched literal
+        self._assigned = assigned  # watched literal -> value
+
+    def __getitem__(self, atom:object) -> bool or None:
+        return self._assigned.get(self._literals[atom])
+
+    def __iter__(self):
+        return iter(self._literals)
+
+    def __len__(self) -> int:
+        return len(self._literals)
+
+    def __repr__(self) -> str:
+        return '<InputValues {}>'.format(dict(self))
+
+
 class Constraint(Propagator):
     """Base class for a particular class of user defined propagators.
 
@@ -184,6 +288,10 @@ class Constraint(Propagator):
     The basic use is to provides the constructor with a callable
     and the set of atoms to watch and pass to the said callable.
 
+    The callable returns a falsy value if the inputs are valid.
+    Otherwise, it returns either True, or the set of input atoms responsible
+    of the violation, which leads to a stronger pruning of the search space.
+
     >>> Constraint(lambda ins: ins['q'], inputs={'q'})  #doctest: +ELLIPSIS
     <clyngor.propagators.Constraint object at ...>
 
@@ -194,7 +302,7 @@ class Constraint(Propagator):
         self.__formula = formula
 
     def on_all_input(self, values:dict):
-        return self.__formula(values)
+        return self.__formula(dict(values))  # formula may keep its inputs
 
     # def on_all_inputs(self):
         # pass
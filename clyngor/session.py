@@ -0,0 +1,117 @@
+"""Definition of the Session, wrapping a persistent clingo.Control
+for multi-shot solving: programs can be added, grounded and solved
+as many times as needed, keeping the grounding and the learned
+constraints between calls.
+
+"""
+
+import shlex
+import clyngor
+from clyngor import utils
+from clyngor.answers import ClingoAnswers
+
+
+class Session:
+    """Multi-shot solving over a single clingo.Control.
+
+        session = Session(inline='#external go. p :- go.')
+        session.ground()
+        session.assign_external('go', True)
+        for answer in session.solve().by_predicate:
+            ...
+
+    Answers returned by solve are computed when iterated over,
+    so they should be consumed before the session is modified.
+
+    """
+
+    def __init__(self, files:iter=(), inline:str=None, options:iter=(),
+                 nb_model:int=0, constants:dict={},
+                 propagators:iter=(), observers:iter=(),
+                 clean_path:bool=True):
+        """
+        files -- iterable of files to load
+        inline -- ASP source code to add to base program
+        options -- string or iterable of options for clingo
+        nb_model -- number of model to search for at each solving (0 for all)
+        constants -- mapping name -> value of constants for the grounding
+        propagators -- propagators instances to register
+        observers -- observers instances to register
+        clean_path -- clean the path of given files before using them
+
+        """
+        if not clyngor.clingo_module_available:
+            raise RuntimeError("Session requires the clingo module, which is not available.")
+        import clingo
+        options = list(shlex.split(options) if isinstance(options, str) else options)
+        for name, value in constants.items():
+            options += ['-c', '{}={}'.format(name, value)]
+        self._ctl = clingo.Control(options)
+        self._index = None  # symbol -> literal, built when needed
+        self.nb_model = nb_model
+        files = [files] if isinstance(files, str) else files
+        for file in (map(utils.cleaned_path, files) if clean_path else files):
+            self._ctl.load(file)
+        if inline:
+            self.add(inline)
+        for observer in observers:
+            self._ctl.register_observer(observer)
+        for propagator in propagators:
+            self._ctl.register_propagator(propagator)
+
+
+    @property
+    def control(self) -> object:
+        """The underlying clingo.Control instance"""
+        return self._ctl
+
+    @property
+    def statistics(self) -> dict:
+        return self._ctl.statistics
+
+
+    def add(self, inline:str, program:str='base', params:iter=()) -> 'Session':
+        """Add given ASP source code to given program, taking given parameters"""
+        self._ctl.add(program, list(params), inline)
+        return self
+
+    def ground(self, parts:iter or dict={'base': ()}) -> 'Session':
+        """Ground given programs, with their arguments.
+
+        parts -- mapping or iterable of pairs (program, arguments),
+                 arguments being python values or clingo symbols
+
+        """
+        parts = parts.items() if isinstance(parts, dict) else parts
+        self._index = None
+        self._ctl.ground([(prg, [utils.as_clingo_symbol(arg) for arg in args])
+                          for prg, args in parts])
+        return self
+
+    def assign_external(self, atom:object, value:bool or None=True) -> 'Session':
+        """Set the truth value of given external atom.
+        A value of None makes it free, i.e. open to the solver's choice."""
+        self._ctl.assign_external(utils.as_clingo_symbol(atom), value)
+        return self
+
+    def release_external(self, atom:object) -> 'Session':
+        """Set given external atom to false, permanently"""
+        self._ctl.release_external(utils.as_clingo_symbol(atom))
+        return self
+
+
+    def solve(self, nb_model:int=None, assumptions:iter=()) -> ClingoAnswers:
+        """Return a ClingoAnswers instance yielding the answer sets
+        of the program as currently grounded.
+
+        nb_model -- number of model to search for (default: the session's one)
+        assumptions -- atoms assumed true, or pairs (atom, truth value),
+                       holding for this solving only
+
+        """
+        self._ctl.configuration.solve.models = self.nb_model if nb_model is None else nb_model
+        if assumptions:
+            if self._index is None:
+                self._index = utils.symbolic_atoms_index(self._ctl.symbolic_atoms)
+            assumptions = utils.assumptions_as_literals(assumptions, self._index)
+        return ClingoAnswers(self._ctl, assumptions=assumptions)
@@ -6,13 +6,18 @@
 import re
 import os
 import json
+import math
+import time
 import shlex
+import asyncio
 import tempfile
+import itertools
 import subprocess
+import concurrent.futures
 import clyngor
-from clyngor.answers import Answers, ClingoAnswers
-from clyngor.utils import cleaned_path, ASPSyntaxError, ASPWarning
-from clyngor.parsing import parse_clasp_output, validate_clasp_stderr
+from clyngor.answers import Answers, AsyncAnswers, ClingoAnswers
+from clyngor.utils import cleaned_path, assumptions_as_constraints, ASPSyntaxError, ASPWarning
+from clyngor.parsing import parse_clasp_output, parse_clasp_json_output, validate_clasp_stderr
 from clyngor.propagators import Main as _default_running_sequence
 
 
@@ -23,15 +28,17 @@ def solve(files:iter=(), options:iter=[], inline:str=None,
           clingo_bin_path:str=None, error_on_warning:bool=False,
           force_tempfile:bool=False, delete_tempfile:bool=True,
           use_clingo_module:bool=True, grounding_observers:iter=(),
-          propagators:iter=(), solver_conf:object=None,
+          propagators:iter=(), solver_conf:dict=None,
           running_sequence:callable=_default_running_sequence,
-          programs:iter=(['base', ()],), return_raw_output:bool=False) -> iter:
+          programs:iter=(['base', ()],), return_raw_output:bool=False,
+          output_format:str='text', assumptions:iter=(),
+          ground_cache:object=None) -> iter:
     """Run the solver on given files, with given options, and return
     an Answers instance yielding answer sets.
 
     files -- iterable of files feeding the solver
     options -- string or iterable of options for clingo
-    inline -- ASP source code to feed the solver with
+    inline -- ASP source code to feed the solver with, or iterable of them
     decoders -- iterable of decoders to apply on ASP (see clyngor.decoder)
     subproc_shell -- use shell=True in subprocess call (NB: you should not)
     print_command -- print full command to stdout before running it
@@ -44,30 +51,77 @@ def solve(files:iter=(), options:iter=[], inline:str=None,
     delete_tempfile -- delete used tempfiles
     return_raw_output -- don't parse anything, just return iterators over stdout
                          and stderr, without using clingo module
+    output_format -- 'text' (default) or 'json', the format clingo binary
+                     will output and clyngor will read. With 'json',
+                     statistics are typed and nested as given by clingo.
 
     The following options needs the propagator support and/or python clingo module:
     grounding_observers -- iterable of observers to add to the grounding process
     propagators -- iterable of propagators to add to the solving process
-    solver_conf -- clingo.Configuration instance, given to the running_sequence
     running_sequence -- If given, must be a callable taking programs,
                         files and Configuration, returning both clingo.Control
                         and clingo.SolveHandle instances.
+                        The default one, clyngor.Main, also receives
+                        the inline, assumptions and time_limit keyword
+                        arguments. Other ones are given inline code through
+                        a tempfile added to files, assumptions
+                        as integrity constraints, and can't have
+                        a time_limit (ValueError is raised).
     programs -- programs to feed the running sequence with.
 
     Shortcut to clingo's options:
     nb_model -- number of model to output (0 for all (default), None to disable)
     time_limit -- zero or number of seconds to wait before interrupting solving
+                  (with clingo module, grounding time is not counted)
     constants -- mapping name -> value of constants for the grounding
+    solver_conf -- mapping of solver settings, with keys among
+                   threads, configuration, heuristic and opt_strategy
+                   (see SOLVER_CONF_OPTIONS)
+    assumptions -- atoms assumed true, or pairs (atom, truth value).
+                   With clingo module, they are given to the solver
+                   after grounding, otherwise they are added to the program
+                   as integrity constraints.
+    ground_cache -- GroundingCache instance, or directory of one, or True
+                    for the default one. If given, grounding and solving
+                    are decoupled, and the grounding is reused if the same
+                    input was already grounded. Implies clingo binary usage.
+                    Files included with #include "file". are part of
+                    the input, but not <library> includes.
 
     """
     files = [files] if isinstance(files, str) else files
     files = tuple(map(cleaned_path, files) if clean_path else files)
     stdin_feed = None  # data to send to stdin
-    use_clingo_module = use_clingo_module and clyngor.have_clingo_module() and not return_raw_output
-    if use_clingo_module:
-        # the clingo API do not handle stdin feeding
-        force_tempfile = True
-    if inline and not files and not force_tempfile:  # avoid tempfile if possible
+    use_ground_cache = ground_cache is not None and ground_cache is not False and not return_raw_output
+    use_clingo_module = use_clingo_module and clyngor.have_clingo_module() and not return_raw_output and not use_ground_cache
+    inline_chunks = (inline,) if isinstance(inline, str) else tuple(inline or ())
+    inline = '\n'.join(inline_chunks) or None
+    # only the default running sequence handles inline code, assumptions and time limit
+    direct_sequence = use_clingo_module and running_sequence is _default_running_sequence
+    if time_limit and use_clingo_module and not direct_sequence:
+        raise ValueError("Option 'time_limit' is not supported with a custom"
+                         " running_sequence, which handles the solving itself.")
+    if assumptions and not direct_sequence:
+        inline = (inline or '') + '\n' + assumptions_as_constraints(assumptions)
+    if solver_conf and not use_clingo_module:
+        options = list(shlex.split(options) if isinstance(options, str) else options)
+        options += solver_conf_options(solver_conf)
+    if use_ground_cache:
+        from clyngor.grounding import grounded_program, solve_from_grounded
+        grounded = grounded_program(files, inline, ground_cache=ground_cache,
+                                    options=options, constants=constants,
+                                    clean_path=False, clingo_bin_path=clingo_bin_path,
+                                    error_on_warning=error_on_warning,
+                                    use_clingo_module=False)
+        return solve_from_grounded(grounded, options=options, decoders=decoders,
+                                   subproc_shell=subproc_shell, print_command=print_command,
+                                   nb_model=nb_model, time_limit=time_limit,
+                                   stats=stats, clingo_bin_path=clingo_bin_path,
+                                   error_on_warning=error_on_warning,
+                                   use_clingo_module=False, output_format=output_format)
+    if direct_sequence and not force_tempfile:
+        pass  # inline code is directly given to the clingo module
+    elif inline and not files and not force_tempfile and not use_clingo_module:  # avoid tempfile if possible
         stdin_feed, inline = inline, None
     elif inline:
         with tempfile.NamedTemporaryFile(mode='w', delete=False) as fd:
@@ -76,7 +130,8 @@ def solve(files:iter=(), options:iter=[], inline:str=None,
             files = tuple(files) + (tempfile_to_del,)
             assert files, fd.name
     run_command = command(files, options, inline, nb_model, time_limit,
-                          constants, stats, clingo_bin_path=clingo_bin_path)
+                          constants, stats, clingo_bin_path=clingo_bin_path,
+                          output_format=output_format)
 
     if print_command:
         print(run_command)
@@ -88,17 +143,26 @@ def solve(files:iter=(), options:iter=[], inline:str=None,
 
 
     if use_clingo_module:
-        if time_limit != 0 or constants:
-            raise ValueError("Options 'time_limit' and 'constants' are not "
-                             "handled when used with python clingo module.")
-        if solver_conf:
-            raise NotImplementedError("Solver configuration handling is currently"
-                                      "not implemented")
         options = list(shlex.split(options) if isinstance(options, str) else options)
+        for name, value in constants.items():
+            options += ['-c', '{}={}'.format(name, value)]
+        if solver_conf and 'threads' in solver_conf:
+            # solvers are created with the Control, not afterward
+            options += solver_conf_options({'threads': solver_conf['threads']})
         ctl = clyngor.clingo_module.Control(options)
+        if solver_conf:
+            apply_solver_conf(ctl.configuration, solver_conf)
+        kwargs = {}
+        if direct_sequence:
+            if assumptions:
+                kwargs['assumptions'] = assumptions
+            if time_limit:
+                kwargs['time_limit'] = time_limit
+            if inline and not force_tempfile:
+                kwargs['inline'] = inline_chunks
         main = running_sequence(programs=programs, files=files, nb_model=nb_model,
                                 propagators=propagators, observers=grounding_observers,
-                                generator=True)
+                                generator=True, **kwargs)
         return main(ctl)
     else:
         clingo = subprocess.Popen(
@@ -125,7 +189,8 @@ def solve(files:iter=(), options:iter=[], inline:str=None,
         if inline and tempfile_to_del and delete_tempfile:
             on_end = lambda: (os.remove(tempfile_to_del), clingo.stderr.close(), clingo.stdout.close())
 
-        answers = _gen_answers(stdout, stderr, statistics, specific_statuses, error_on_warning)
+        answers = _gen_answers(stdout, stderr, statistics, specific_statuses,
+                               error_on_warning, output_format=output_format)
         return Answers(answers,
                        command=' '.join(run_command), on_end=on_end,
                        decoders=decoders, statistics=statistics,
@@ -133,15 +198,280 @@ def solve(files:iter=(), options:iter=[], inline:str=None,
                        with_optimization=True)
 
 
+# Settings of solver_conf, with their clingo option.
+SOLVER_CONF_OPTIONS = {
+    'threads': '--parallel-mode',
+    'configuration': '--configuration',
+    'heuristic': '--heuristic',
+    'opt_strategy': '--opt-strategy',
+}
+
+
+def _validated_solver_conf(solver_conf:dict) -> dict:
+    unknown = set(solver_conf) - set(SOLVER_CONF_OPTIONS)
+    if unknown:
+        raise ValueError("Unknown solver settings {}. Valid ones are {}."
+                         "".format(', '.join(sorted(unknown)), ', '.join(SOLVER_CONF_OPTIONS)))
+    return {key: str(value) for key, value in solver_conf.items() if value is not None}
+
+
+def solver_conf_options(solver_conf:dict) -> list:
+    """Return the clingo options equivalent to given solver settings
+
+    >>> solver_conf_options({'threads': 4, 'configuration': 'trendy'})
+    ['--parallel-mode=4', '--configuration=trendy']
+
+    """
+    return ['{}={}'.format(SOLVER_CONF_OPTIONS[key], value)
+            for key, value in _validated_solver_conf(solver_conf).items()]
+
+
+def apply_solver_conf(configuration:object, solver_conf:dict):
+    """Apply given solver settings on given clingo.Configuration,
+    except the number of threads, which must be given to the Control
+    at its creation"""
+    solver_conf = _validated_solver_conf(solver_conf)
+    if 'configuration' in solver_conf:
+        configuration.configuration = solver_conf['configuration']
+    for key in ('heuristic', 'opt_strategy'):
+        if key in solver_conf:
+            for idx in range(len(configuration.solver)):  # for all threads
+                setattr(configuration.solver[idx], key, solver_conf[key])
+
+
+def consequences(kind:str, files:iter=(), options:iter=[], **kwargs) -> Answers:
+    """Return an Answers instance yielding the successive approximations
+    of the cautious or brave consequences computed by clingo, the last one
+    being the consequences themselves (if nb_model is left to 0).
+
+    kind -- 'cautious' (atoms in all models) or 'brave' (atoms in any model)
+    files, options, kwargs -- given to solve
+
+    """
+    if kind not in {'cautious', 'brave'}:
+        raise ValueError("Consequences must be 'cautious' or 'brave', not " + repr(kind))
+    options = list(shlex.split(options) if isinstance(options, str) else options)
+    return solve(files, options + ['--enum-mode=' + kind], **kwargs)
+
+
+def cautious(*args, **kwargs) -> frozenset or None:
+    """Return the cautious consequences, i.e. the atoms found in all models,
+    or None if there is no model.
+    Expects same (kw)args as solve. See consequences for streaming access
+    to the approximations and to the formatting options.
+
+    """
+    model = None
+    for model in consequences('cautious', *args, **kwargs):
+        pass
+    return model
+
+
+def brave(*args, **kwargs) -> frozenset or None:
+    """Return the brave consequences, i.e. the atoms found in any model,
+    or None if there is no model.
+    Expects same (kw)args as solve. See consequences for streaming access
+    to the approximations and to the formatting options.
+
+    """
+    model = None
+    for model in consequences('brave', *args, **kwargs):
+        pass
+    return model
+
+
+def count_models(files:iter=(), options:iter=[], inline:str=None,
+                 nb_model:int=0, time_limit:int=0, constants:dict={},
+                 clean_path:bool=True, clingo_bin_path:str=None,
+                 use_clingo_module:bool=True) -> int:
+    """Return the number of models found by the solver, without printing
+    nor parsing any of them.
+
+    With clingo binary, model printing is disabled (-q), and the number
+    is read from the JSON output. With clingo module, models are counted
+    as they are found, without any conversion.
+
+    Arguments are the same as for solve.
+
+    """
+    options = list(shlex.split(options) if isinstance(options, str) else options)
+    if not (use_clingo_module and clyngor.have_clingo_module()):
+        answers = solve(files, options + ['-q'], inline, nb_model=nb_model,
+                        time_limit=time_limit, constants=constants,
+                        clean_path=clean_path, stats=False,
+                        clingo_bin_path=clingo_bin_path,
+                        use_clingo_module=False, output_format='json')
+        for _ in answers: pass  # read the output
+        return answers.statistics.get('Models', {}).get('Number', 0)
+    for name, value in constants.items():
+        options += ['-c', '{}={}'.format(name, value)]
+    files = [files] if isinstance(files, str) else files
+    ctl = clyngor.clingo_module.Control(options)
+    for file in (map(cleaned_path, files) if clean_path else files):
+        ctl.load(file)
+    for chunk in ((inline,) if isinstance(inline, str) else inline or ()):
+        ctl.add('base', [], chunk)
+    ctl.ground([('base', [])])
+    ctl.configuration.solve.models = nb_model or 0
+    nb_found = 0
+    def on_model(model):
+        nonlocal nb_found
+        nb_found += 1
+    if time_limit:
+        with ctl.solve(on_model=on_model, async_=True) as handle:
+            if not handle.wait(time_limit):
+                handle.cancel()
+    else:
+        ctl.solve(on_model=on_model)
+    return nb_found
+
+
+def solve_many(jobs:dict or iter, max_workers:int=None, **kwargs) -> iter:
+    """Run the solver on all given jobs concurrently, and yield pairs
+    (job key, Answers instance) as soon as each job is done.
+
+    jobs -- mapping {key: solve kwargs}, or iterable of (key, solve kwargs)
+    max_workers -- maximal number of concurrent solvings
+    kwargs -- keyword arguments given to all solve calls,
+              overridden by the ones of each job
+
+    Answers instances are prefetched: all their answer sets are already read.
+    If a job raises an exception, like ASPSyntaxError, it is yielded instead
+    of the Answers instance, and other jobs are not impacted.
+
+    """
+    def run_job(job_kwargs:dict) -> Answers:
+        return solve(**{**kwargs, **job_kwargs}).prefetch()
+    return _run_concurrently(run_job, jobs, max_workers)
+
+
+def _run_concurrently(run_job:callable, jobs:dict or iter, max_workers:int=None) -> iter:
+    """Call run_job on all given jobs concurrently, and yield pairs
+    (job key, result or raised exception) as soon as each job is done.
+
+    Jobs are submitted as workers become free, and their results are not
+    kept once yielded, so memory does not grow with the number of jobs.
+
+    """
+    jobs = iter(jobs.items() if isinstance(jobs, dict) else jobs)
+    max_workers = max_workers or min(32, (os.cpu_count() or 1) + 4)  # as ThreadPoolExecutor
+    with concurrent.futures.ThreadPoolExecutor(max_workers) as executor:
+        running = {}  # future -> job key
+        try:
+            while True:
+                for key, job_kwargs in itertools.islice(jobs, max_workers - len(running)):
+                    running[executor.submit(run_job, job_kwargs)] = key
+                if not running:
+                    return
+                done, _ = concurrent.futures.wait(
+                    running, return_when=concurrent.futures.FIRST_COMPLETED)
+                for future in done:
+                    key, error = running.pop(future), future.exception()
+                    yield key, future.result() if error is None else error
+                del done, future  # do not keep the last results alive
+        finally:  # do not run the remaining jobs if caller stopped the iteration
+            for future in running:
+                future.cancel()
+
+
+# Solver configurations raced by tune by default.
+TUNING_CANDIDATES = tuple({'configuration': configuration} for configuration in
+                          ('auto', 'frumpy', 'jumpy', 'tweety', 'handy', 'crafty', 'trendy'))
+
+
+def tune(files:iter=(), candidates:iter=TUNING_CANDIDATES, budget:int=60,
+         inline:str=None, nb_model:int=1, max_workers:int=None,
+         **kwargs) -> [(dict, float or None)]:
+    """Race given solver configurations on given program, and return
+    pairs (solver_conf, solving time), fastest configuration first.
+
+    files -- iterable of files feeding the solver
+    candidates -- iterable of solver_conf to try (see solve)
+    budget -- number of seconds after which a candidate is stopped, its
+              solving time being then None
+    inline -- ASP source code to feed the solver with
+    nb_model -- number of model to search for (0 for all, or up to optimum)
+    max_workers -- maximal number of concurrent solvings (default: all)
+    kwargs -- other keyword arguments given to all solve calls
+
+    All candidates are run concurrently with the clingo binary,
+    so they should be given the same amount of CPUs.
+
+    """
+    candidates = tuple(candidates)
+    budget = math.ceil(budget)
+    def run_job(solver_conf:dict) -> (Answers, float):
+        # timed in the worker, so waiting for a free worker is not counted
+        start = time.perf_counter()
+        answers = solve(files=files, inline=inline, nb_model=nb_model,
+                        time_limit=budget, use_clingo_module=False,
+                        solver_conf=solver_conf, **kwargs).prefetch()
+        return answers, time.perf_counter() - start
+    jobs = dict(enumerate(candidates))
+    timings = {}
+    for idx, result in _run_concurrently(run_job, jobs, max_workers or len(jobs)):
+        if isinstance(result, Exception):
+            raise result
+        answers, elapsed = result
+        # optimization stopped by the time limit is not unknown, but satisfiable
+        timed_out = answers.is_unknown or 'TIME LIMIT' in answers.statistics
+        timings[idx] = None if timed_out else elapsed
+    ranking = sorted(timings, key=lambda idx: (timings[idx] is None, timings[idx] or 0))
+    return [(candidates[idx], timings[idx]) for idx in ranking]
+
+
+def asolve(files:iter=(), options:iter=[], inline:str=None,
+           decoders:iter=(), nb_model:int=0, time_limit:int=0, constants:dict={},
+           clean_path:bool=True, stats:bool=True, clingo_bin_path:str=None,
+           error_on_warning:bool=False, delete_tempfile:bool=True) -> AsyncAnswers:
+    """Asynchronous version of solve, running the clingo binary
+    in an asyncio subprocess, and returning an AsyncAnswers instance
+    yielding answer sets as soon as clingo outputs them.
+
+    The clingo process is started at the beginning of the iteration,
+    and killed if the iteration is cancelled before its end.
+
+        async for answer in asolve(inline='a;b.').by_predicate:
+            ...
+
+    Arguments are the same as for solve, when not using clingo module.
+
+    """
+    files = [files] if isinstance(files, str) else files
+    files = tuple(map(cleaned_path, files) if clean_path else files)
+    stdin_feed, tempfile_to_del = None, None
+    if inline and not files:
+        stdin_feed, inline = inline, None
+    elif inline:
+        with tempfile.NamedTemporaryFile(mode='w', delete=False) as fd:
+            fd.write(inline)
+            tempfile_to_del = fd.name
+            files = tuple(files) + (tempfile_to_del,)
+    run_command = command(files, options, inline, nb_model, time_limit,
+                          constants, stats, clingo_bin_path=clingo_bin_path)
+    statistics = {}
+    specific_statuses = {
+        'unsat': False,
+        'unknown': False,
+    }
+    answers = _agen_answers(run_command, stdin_feed, statistics, specific_statuses,
+                            error_on_warning, tempfile_to_del if delete_tempfile else None)
+    return AsyncAnswers(answers, command=' '.join(run_command),
+                        decoders=decoders, statistics=statistics,
+                        specific_statuses=specific_statuses)
+
+
 def command(files:iter=(), options:iter=[], inline:str=None,
             nb_model:int=0, time_limit:int=0, constants:dict={},
-            stats:bool=True, clingo_bin_path:str=None) -> iter:
+            stats:bool=True, clingo_bin_path:str=None,
+            output_format:str='text') -> iter:
     """Return the shell command running the solver on given files,
     with given options.
 
     files -- iterable of files feeding the solver
     options -- string or iterable of options for clingo
     clingo_bin_path -- the path to the clingo binary
+    output_format -- 'text' (default) or 'json', the latter providing --outf=2
 
     Shortcut to clingo's options:
     nb_model -- number of model to output (0 for all (default), None to disable)
@@ -173,19 +503,27 @@ def command(files:iter=(), options:iter=[], inline:str=None,
         options.append('-n 0')
     if stats:
         options.append('--stats')
+    if output_format == 'json':
+        options.append('--outf=2')
+    elif output_format != 'text':
+        raise ValueError("Output format must be 'text' or 'json', not " + repr(output_format))
 
     return [clingo_bin_path or clyngor.CLINGO_BIN_PATH, *options, *files]
 
 
-def clingo_version(clingo_bin_path:str=None) -> dict:
-    """Return clingo's version information in a dict"""
-    if clyngor.clingo_module_actived():
+def clingo_version(clingo_bin_path:str=None, from_binary:bool=False) -> dict:
+    """Return clingo's version information in a dict
+
+    from_binary -- query the clingo binary, even if the clingo module is used
+
+    """
+    if clyngor.clingo_module_actived() and not from_binary:
         return {
-            'clingo version': clingo.__version__,
+            'clingo version': clyngor.clingo_module.__version__,
             'python': '3' if clyngor.utils.try_python_availability_in_clingo_module() else None,
             'lua': 'yes' if clyngor.utils.try_lua_availability_in_clingo_module() else None,
         }
-    clingo = subprocess.Popen(
+    process = subprocess.Popen(
         [clingo_bin_path or clyngor.CLINGO_BIN_PATH, '--version', '--outf=2'],
         stderr = subprocess.PIPE,
         stdout = subprocess.PIPE,
@@ -199,7 +537,7 @@ def clingo_version(clingo_bin_path:str=None) -> dict:
         'python': re.compile(r'with[out]{0,3}\sPython\s?([0-9\.]+)?'),  # later loop will yields None if python is available
         'lua': re.compile(r'with[out]{0,3}\sLua\s?([0-9\.]+)?'),  # same for lua
     }
-    stdout = clingo.communicate()[0].decode()
+    stdout = process.communicate()[0].decode()
     values = {}
     for field, reg in fields.items():
         match = reg.search(stdout)
@@ -209,15 +547,18 @@ def clingo_version(clingo_bin_path:str=None) -> dict:
 
 
 def _gen_answers(stdout:iter, stderr:iter, statistics:dict, specific_statuses:dict,
-                 error_on_warning:bool) -> (str, int or None, bool, int):
+                 error_on_warning:bool, output_format:str='text') -> (str, int or None, bool, int):
     """Yield 4-uplet (answer set, optimization, optimum found, answer number),
     and update given statistics dict with statistics payloads
 
+    output_format -- 'text' or 'json', the format of given stdout
+
     """
+    parse_output = parse_clasp_json_output if output_format == 'json' else parse_clasp_output
     answer = None  # is used to generate a model only when we are sur there is (no) optimization
     answer_number = None
     optimization, optimum_found = None, False
-    for ptype, payload in parse_clasp_output(stdout, yield_stats=True):
+    for ptype, payload in parse_output(stdout, yield_stats=True):
         if ptype == 'answer_number':
             if answer is not None:
                 yield answer, optimization, optimum_found, answer_number
@@ -244,6 +585,12 @@ def _gen_answers(stdout:iter, stderr:iter, statistics:dict, specific_statuses:di
         yield answer, optimization, optimum_found, answer_number
 
     # handle stderr
+    raise_on_stderr(stderr, error_on_warning)
+
+
+def raise_on_stderr(stderr:iter, error_on_warning:bool=False):
+    """Raise the errors found in given clingo stderr lines,
+    and the warnings too if error_on_warning is set"""
     for payload in validate_clasp_stderr(stderr):
         if payload['level'] == 'error' and payload['message'].startswith('syntax error, '):
             raise ASPSyntaxError(
@@ -258,3 +605,48 @@ def _gen_answers(stdout:iter, stderr:iter, statistics:dict, specific_statuses:di
                 pass  # do nothing, user said
         else:
             raise SystemError("Clingo yield a non-handled error " + repr(payload))
+
+
+async def _agen_answers(run_command:list, stdin_feed:str, statistics:dict,
+                        specific_statuses:dict, error_on_warning:bool,
+                        tempfile_to_del:str=None) -> (str, int or None, bool, int):
+    """Asynchronous version of _gen_answers, running itself the given command.
+
+    Output is read line by line and cut before each answer,
+    so each chunk can be parsed by _gen_answers as soon as it is complete.
+
+    """
+    clingo = await asyncio.create_subprocess_exec(
+        *run_command,
+        stdin=subprocess.PIPE if stdin_feed else None,
+        stdout=subprocess.PIPE,
+        stderr=subprocess.PIPE,
+        limit=2 ** 30,  # answer sets are given in one, possibly huge, line
+    )
+    stderr = asyncio.ensure_future(clingo.stderr.read())  # avoid the filling of stderr pipe
+    try:
+        if stdin_feed:
+            clingo.stdin.write(stdin_feed.encode())
+            await clingo.stdin.drain()
+            clingo.stdin.close()
+        lines = []  # current answer, or lines preceding the first one
+        async for line in clingo.stdout:
+            line = line.decode()
+            if line.startswith('Answer: '):
+                if lines and lines[0].startswith('Answer: '):
+                    for answer in _gen_answers(lines, iter(()), statistics,
+                                               specific_statuses, error_on_warning):
+                        yield answer
+                lines = []
+            lines.append(line)
+        stderr_lines = iter((await stderr).decode().splitlines())
+        for answer in _gen_answers(lines or [''], stderr_lines, statistics,
+                                   specific_statuses, error_on_warning):
+            yield answer
+    finally:
+        stderr.cancel()
+        if clingo.returncode is None:
+            clingo.kill()
+            await clingo.wait()
+        if tempfile_to_del:
+            os.remove(tempfile_to_del)
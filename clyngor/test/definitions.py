@@ -53,9 +53,19 @@ def skipif_no_clingo_module(func):
     )(func)
 
 
+def skipif_clingo_module_not_available(func):
+    """Skip the test if clingo module is not importable,
+    whether it is used by default or not"""
+    return pytest.mark.skipif(
+        not clyngor.clingo_module_available,
+        reason="Require official clingo module to be importable"
+    )(func)
+
+
 # clearer names and oppositions
 onlyif_clingo_module = skipif_no_clingo_module
 onlyif_python_support = skipif_clingo_without_python
+onlyif_clingo_module_available = skipif_clingo_module_not_available
 
 def onlyif_no_python_support(func):
     return pytest.mark.skipif(
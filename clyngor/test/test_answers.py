@@ -379,3 +379,82 @@ def test_pyasp_and_nested_atoms():
     expected_a = frozenset((Atom('a', (Atom('b', ('c', 'd')),)),))
     print('LBTL:', type(answer_a), answer_a)
     assert answer_a == expected_a, (answer_a, type(answer_a))
+
+
+def test_as_columns(simple_answers):
+    atoms, indptr, indices = simple_answers.as_columns()
+    assert len(atoms) == 10
+    assert list(indptr) == [0, 2, 4, 6, 8, 10]
+    models = [frozenset(atoms[idx] for idx in indices[start:stop])
+              for start, stop in zip(indptr, indptr[1:])]
+    assert models[0] == {('a', (0,)), ('b', (1,))}
+    assert models[-1] == {('i', ()), ('j', ())}
+
+
+def test_as_columns_shared_atoms():
+    answers = Answers(('a b(1)', 'b(1) c', 'a c', '')).atoms_as_string
+    atoms, indptr, indices = answers.as_columns()
+    assert sorted(atoms) == ['a', 'b(1)', 'c']
+    assert list(indptr) == [0, 2, 4, 6, 6]
+    with pytest.raises(ValueError):
+        Answers(('a',)).by_predicate.as_columns()
+
+
+def test_as_matrix():
+    numpy = pytest.importorskip('numpy')
+    matrix, atoms = Answers(('a b(1)', 'b(1) c', 'a c', '')).as_matrix()
+    assert matrix.shape == (4, 3) and matrix.dtype == bool
+    expected = ({'a', 'b'}, {'b', 'c'}, {'a', 'c'}, set())
+    for row, model in zip(matrix, expected):
+        assert {atoms[idx][0] for idx in numpy.flatnonzero(row)} == model
+    assert list(matrix.sum(axis=0)) == [2, 2, 2]
+
+
+def test_as_sparse_matrix():
+    pytest.importorskip('scipy')
+    sparse, atoms = Answers(('a b(1)', 'b(1) c', 'a c', '')).as_matrix(sparse=True)
+    dense, same_atoms = Answers(('a b(1)', 'b(1) c', 'a c', '')).as_matrix()
+    assert atoms == same_atoms
+    assert (sparse.toarray() == dense).all()
+
+
+def test_interned():
+    models = ('a(1) b("c",(d,e))', 'b("c",(d,e)) f', 'a(1) f')
+    regular = tuple(Answers(models))
+    interned = tuple(Answers(models).interned)
+    assert regular == interned
+    first, second, third = (dict((atom, atom) for atom in model) for model in interned)
+    assert first[('a', (1,))] is third[('a', (1,))]
+    assert first[('b', ('"c"', ('', ('d', 'e'))))] is second[('b', ('"c"', ('', ('d', 'e'))))]
+    assert second[('f', ())] is third[('f', ())]
+
+
+def test_interned_atoms_as_string():
+    first, second = Answers(('a(1) b', 'a(1) c')).atoms_as_string.interned
+    assert first == {'a(1)', 'b'} and second == {'a(1)', 'c'}
+    assert next(atom for atom in first if atom == 'a(1)') is next(atom for atom in second if atom == 'a(1)')
+
+
+def test_lazy():
+    raw = (
+        ('a(1) b("c")', 3, False, 1),
+        ('a(2) b("c")', 2, False, 2),
+        ('a(3)', 1, True, 3),
+    )
+    expected = tuple(Answers(raw, with_optimization=True).with_answer_number)
+    models = tuple(Answers(raw, with_optimization=True).lazy)
+    assert all(model._atoms is None for model in models), "nothing parsed yet"
+    assert [(model.raw, model.cost, model.optimality, model.number) for model in models] == list(raw)
+    assert models[0].atoms == expected[0][0]
+    assert models[0].atoms is models[0].atoms, "parsed only once"
+    assert models[1]._atoms is None
+    assert set(models[1]) == expected[1][0]
+    assert len(models[2]) == 1
+    assert ('a', (3,)) in models[2]
+
+
+def test_lazy_with_formatting():
+    model, = Answers(('a(1,2) b(3)',)).by_predicate.first_arg_only.lazy
+    assert model.raw == 'a(1,2) b(3)'
+    assert model.atoms == {'a': {1}, 'b': {3}}
+    assert 'a' in model
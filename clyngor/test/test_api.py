@@ -4,7 +4,7 @@ import pytest
 import clyngor
 from clyngor import ASP, solve, command
 from clyngor import utils, CLINGO_BIN_PATH
-from .definitions import run_with_clingo_binary_only
+from .definitions import run_with_clingo_binary_only, run_with_clingo_module_only
 from .test_time_limit import QUEENS
 
 
@@ -240,6 +240,18 @@ def test_unsatisfiable():
     assert len(models.statistics) == 4
 
 
+@run_with_clingo_module_only
+def test_statuses_with_module():
+    models = clyngor.solve(inline='p(1). q(1). :- p(X), q(X).')
+    assert next(models, None) is None
+    assert models.is_unsatisfiable
+    assert not models.is_unknown
+    models = clyngor.solve(inline='{p}.')
+    assert len(tuple(models)) == 2
+    assert not models.is_unsatisfiable
+    assert not models.is_unknown
+
+
 def test_unsatisfiable_statistics():
     "Should return an empty answers set but provide the statistics"
     CODE = """
@@ -0,0 +1,130 @@
+"""Tests of the binary storage of answer sets"""
+
+import os
+import math
+import tempfile
+import pytest
+from clyngor import ModelWriter, ModelReader, Answers, solve
+from .definitions import run_with_clingo_binary_only
+
+
+MODELS = (
+    'a(1) b("c,d",(e,2))',
+    'b("c,d",(e,2)) f',
+    '',
+    'a(1) f g(-3)',
+)
+
+
+@pytest.fixture
+def filename():
+    with tempfile.NamedTemporaryFile(delete=False) as fd:
+        name = fd.name
+    yield name
+    os.remove(name)
+
+
+@pytest.mark.parametrize('compress', [False, True])
+def test_write_and_read(filename, compress):
+    expected = tuple(Answers(MODELS))
+    with ModelWriter(filename, compress=compress) as writer:
+        assert writer.write_all(Answers(MODELS)) == 4
+    with ModelReader(filename) as reader:
+        assert len(reader) == 4
+        assert reader.compress == compress
+        assert len(reader.atoms) == 4
+        assert tuple(reader) == expected
+        assert reader[3] == expected[3]
+        assert reader[-2] == frozenset()
+        assert sorted(reader.atoms[idx] for idx in reader.ids(0)) == sorted(expected[0])
+
+
+def test_other_formatting(filename):
+    expected = tuple(Answers(MODELS).atoms_as_string.sorted)
+    with ModelWriter(filename) as writer:
+        writer.write_all(expected)
+    with ModelReader(filename, answer_set_builder=tuple) as reader:
+        assert tuple(reader) == expected
+
+
+def test_append_while_reading(filename):
+    first, second, *others = Answers(MODELS)
+    with ModelWriter(filename, compress=True) as writer:
+        writer.write(first)
+        writer.flush()
+        with ModelReader(filename) as reader:
+            assert tuple(reader) == (first,)
+        assert writer.write(second) == 1
+    with ModelWriter(filename, append=True) as writer:
+        assert writer.compress
+        assert writer.write_all(others) == 2
+        assert len(writer) == 4
+    with ModelReader(filename) as reader:
+        assert tuple(reader) == tuple(Answers(MODELS))
+        assert len(reader.atoms) == 4, "atoms are not written twice"
+
+
+def test_append_after_partial_record(filename):
+    with ModelWriter(filename) as writer:
+        writer.write_all(Answers(MODELS[:2]))
+    with open(filename, 'ab') as fd:  # interrupted while writing a record
+        fd.write(b'M\x10\x00')
+    with ModelWriter(filename, append=True) as writer:
+        assert writer.write({('h', ())}) == 2
+    with ModelReader(filename) as reader:
+        assert len(reader) == 3
+        assert reader[2] == {('h', ())}
+
+
+def test_unflushed_file(filename):
+    with ModelReader(filename) as reader:  # empty file
+        assert len(reader) == 0 and not reader.atoms
+    with ModelWriter(filename) as writer:
+        with ModelReader(filename) as reader:  # header not flushed yet
+            assert len(reader) == 0
+        writer.write({('a', ())})
+        writer.flush()
+        with ModelReader(filename) as reader:
+            assert list(reader) == [{('a', ())}]
+    open(filename, 'wb').close()  # appending to an empty file
+    with ModelWriter(filename, append=True, compress=True) as writer:
+        writer.write({('b', ())})
+    with ModelReader(filename) as reader:
+        assert reader.compress
+        assert list(reader) == [{('b', ())}]
+
+
+def test_not_a_models_file(filename):
+    with open(filename, 'w') as fd:
+        fd.write('a b c\n')
+    with pytest.raises(ValueError):
+        ModelReader(filename)
+
+
+def test_infinite_numbers(filename):
+    models = [{('p', (math.inf,)), ('q', (-math.inf, 'a'))}, {('r', ())}]
+    with ModelWriter(filename) as writer:
+        writer.write_all(models)
+    with ModelReader(filename) as reader:
+        assert list(reader) == models
+
+
+def test_unsupported_values(filename):
+    with ModelWriter(filename) as writer:
+        with pytest.raises(TypeError):
+            writer.write({'p': {('a',)}})  # as given by Answers.by_predicate
+        with pytest.raises(TypeError):
+            writer.write({('p', (frozenset(),))})
+        writer.write({('p', ('a',))})
+    with ModelReader(filename) as reader:
+        assert list(reader) == [{('p', ('a',))}]
+
+
+@run_with_clingo_binary_only
+def test_write_while_solving(filename):
+    with ModelWriter(filename) as writer:
+        for model in solve(inline='1{p(1..5)}2.'):
+            writer.write(model)
+    with ModelReader(filename) as reader:
+        assert set(reader) == set(solve(inline='1{p(1..5)}2.'))
+        assert len(reader) == 15
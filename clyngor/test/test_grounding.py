@@ -1,8 +1,11 @@
 """Testing of the decoupled grounding/solving API"""
 
+import os
 import pytest
-from clyngor import grounded_program, solve_from_grounded, solve as solve_standard, opt_models_from_clyngor_answers
-from .definitions import run_with_clingo_binary_only
+import clyngor
+from clyngor import grounded_program, solve_from_grounded, solve as solve_standard, opt_models_from_clyngor_answers, GroundingCache
+from clyngor import ground_and_solve, ground_to_file, solve_from_grounded_file
+from .definitions import run_with_clingo_binary_only, run_with_clingo_module_only
 
 
 @run_with_clingo_binary_only
@@ -29,3 +32,125 @@ nb(sum,N):- N=#sum{X:p(X)}.
     found = frozenset(opt_models_from_clyngor_answers(solve_from_grounded(grounded).by_predicate))
     expected = frozenset(opt_models_from_clyngor_answers(solve_standard(inline=ASP).by_predicate))
     assert found == expected
+
+
+@run_with_clingo_binary_only
+def test_grounding_cache(tmp_path):
+    cache = GroundingCache(str(tmp_path))
+    prg = '1{p(a;b;c)}1.'
+    grounded = grounded_program(inline=prg, ground_cache=cache)
+    assert len(list(tmp_path.iterdir())) == 1
+    key, = (path.stem for path in tmp_path.iterdir())
+    assert key in cache
+    assert cache.get(key) == grounded
+    # any change in the input leads to another grounding
+    grounded_program(inline=prg, ground_cache=cache, constants={'n': 2})
+    grounded_program(inline=prg + ' q.', ground_cache=cache)
+    assert len(list(tmp_path.iterdir())) == 3
+    # cached grounding is used by solve
+    cache.put(key, grounded_program(inline='p(d).'))
+    assert set(solve_standard(inline=prg, ground_cache=str(tmp_path))) == {
+        frozenset({('p', ('d',))})
+    }
+    cache.clear()
+    assert not list(tmp_path.iterdir())
+
+
+@run_with_clingo_binary_only
+def test_grounding_cache_with_files(tmp_path):
+    encoding = tmp_path / 'encoding.lp'
+    encoding.write_text('1{p(a;b;c)}1.')
+    cache = GroundingCache(str(tmp_path / 'cache'))
+    expected = frozenset(solve_standard(str(encoding)))
+    assert frozenset(solve_standard(str(encoding), ground_cache=cache)) == expected
+    assert frozenset(solve_standard(str(encoding), ground_cache=cache)) == expected
+    encoding.write_text('1{p(a;b)}1.')  # the file content is part of the key
+    assert len(frozenset(solve_standard(str(encoding), ground_cache=cache))) == 2
+    assert len(list((tmp_path / 'cache').iterdir())) == 2
+
+
+@run_with_clingo_binary_only
+def test_grounding_cache_with_included_files(tmp_path):
+    (tmp_path / 'data.lp').write_text('p(a;b).')
+    encoding = tmp_path / 'encoding.lp'
+    encoding.write_text('#include "data.lp". 1{q(X): p(X)}1.')
+    cache = GroundingCache(str(tmp_path / 'cache'))
+    assert len(frozenset(solve_standard(str(encoding), ground_cache=cache))) == 2
+    (tmp_path / 'data.lp').write_text('p(a;b;c).')  # included content is part of the key
+    assert len(frozenset(solve_standard(str(encoding), ground_cache=cache))) == 3
+
+
+@run_with_clingo_module_only
+def test_grounding_cache_with_clingo_module(tmp_path):
+    cache = GroundingCache(str(tmp_path))
+    assert set(solve_standard(inline='1{p(a;b)}1.', ground_cache=cache)) == {
+        frozenset({('p', ('a',))}), frozenset({('p', ('b',))})
+    }
+    assert len(list(tmp_path.iterdir())) == 1
+
+
+@run_with_clingo_binary_only
+def test_grounding_cache_eviction(tmp_path):
+    cache = GroundingCache(str(tmp_path), max_size=10)
+    cache.put('first', 'a' * 4)
+    cache.put('second', 'b' * 4)
+    os.utime(cache.path('first'), (0, 0))
+    os.utime(cache.path('second'), (1, 1))
+    assert cache.get('first') == 'aaaa'  # now the most recently used
+    cache.put('third', 'c' * 4)
+    assert 'first' in cache and 'third' in cache
+    assert 'second' not in cache
+    assert cache.get('second') is None
+
+
+@run_with_clingo_binary_only
+def test_grounding_error():
+    with pytest.raises(clyngor.ASPSyntaxError):
+        grounded_program(inline='p(.')
+
+
+@run_with_clingo_binary_only
+def test_streamed_grounding_stopped_early(monkeypatch):
+    started = []
+    def run_gringo(*args, **kwargs):
+        started.append(run_gringo.original(*args, **kwargs))
+        return started[-1]
+    run_gringo.original = clyngor.grounding._run_gringo
+    monkeypatch.setattr(clyngor.grounding, '_run_gringo', run_gringo)
+    answers = ground_and_solve(inline='{p(1..5)}.')
+    assert next(iter(answers)) is not None
+    answers.clean_resources()
+    (gringo, stderr), = started
+    assert gringo.returncode is not None
+    assert stderr.closed
+
+
+@run_with_clingo_binary_only
+def test_streamed_grounding(tmp_path):
+    prg = '1{p(a;b;c)}1. #const n=1. q(n).'
+    expected = frozenset(solve_standard(inline=prg, constants={'n': 2}))
+    assert frozenset(ground_and_solve(inline=prg, constants={'n': 2})) == expected
+    grounded = str(tmp_path / 'grounded.aspif')
+    found = frozenset(ground_and_solve(inline=prg, constants={'n': 2}, grounded_file=grounded))
+    assert found == expected
+    assert frozenset(solve_from_grounded_file(grounded)) == expected  # file is kept
+
+
+@run_with_clingo_binary_only
+def test_streamed_grounding_with_files(tmp_path):
+    encoding = tmp_path / 'encoding.lp'
+    encoding.write_text('1{p(X): q(X)}1.')
+    expected = frozenset(solve_standard(str(encoding), inline='q(1..3).'))
+    assert len(expected) == 3
+    assert frozenset(ground_and_solve(str(encoding), inline='q(1..3).')) == expected
+    grounded = ground_to_file(str(tmp_path / 'grounded.aspif'), str(encoding), inline='q(1..3).')
+    assert frozenset(solve_from_grounded_file(grounded)) == expected
+    assert frozenset(solve_from_grounded(grounded_program(str(encoding), inline='q(1..3).'))) == expected
+
+
+@run_with_clingo_binary_only
+def test_streamed_grounding_error(tmp_path):
+    with pytest.raises(clyngor.ASPSyntaxError):
+        list(ground_and_solve(inline='p(.'))
+    with pytest.raises(clyngor.ASPSyntaxError):
+        ground_to_file(str(tmp_path / 'grounded.aspif'), inline='p(.')
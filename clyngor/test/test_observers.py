@@ -0,0 +1,56 @@
+"""Tests of the GroundProgramObserver, collecting the ground program"""
+
+import clyngor
+from clyngor import GroundProgramObserver, Session
+from .definitions import onlyif_clingo_module_available, run_with_clingo_module_only
+
+
+def observed(inline:str) -> (GroundProgramObserver, Session):
+    observer = GroundProgramObserver()
+    session = Session(inline=inline, observers=[observer]).ground()
+    return observer, session
+
+
+@onlyif_clingo_module_available
+def test_rules_and_queries():
+    observer, _ = observed('a. {b;c}. d :- b, not c. :- c, d. f(X) :- X=1..2, b.')
+    assert len(observer) == 6
+    choice_rule, = (rule for rule in observer if rule.choice)
+    assert tuple(map(str, map(observer.symbol, choice_rule.head))) == ('b', 'c')
+    rule, = observer.rules_defining('d')
+    assert observer.rule_as_text(rule) == 'd :- not c, b.'
+    assert observer.rules_defining(('d', ())) == [rule]
+    assert observer.rules_defining(rule.head[0]) == [rule]
+    assert observer.rule_as_text(observer.rules_defining('f(2)')[0]) == 'f(2) :- b.'
+    assert observer.rules_defining('unknown(1)') == []
+    assert list(map(str, observer.facts)) == ['a']
+    assert observer.rules_by_predicate() == {('f', 1): 2, ('b', 0): 1, ('c', 0): 1,
+                                             ('d', 0): 1, None: 1}
+    stats = observer.statistics
+    assert stats['rules'] == 6
+    assert stats['choice rules'] == 1
+    assert stats['constraints'] == 1
+    assert stats['head literals'] == 6
+    assert stats['body literals'] == 6
+    assert stats['facts'] == 1
+    assert stats['bytes'] > 0
+
+
+@onlyif_clingo_module_available
+def test_weight_rules_and_hidden_atoms():
+    observer, session = observed('{b;c;d}. e :- 3 #sum{1:b;2:c;1:d}. #show e/0.')
+    assert observer.rules_defining('b') == []  # not shown
+    weight_rule, = (rule for rule in observer if rule.lower_bound is not None)
+    assert weight_rule.lower_bound == 3
+    assert all(weight in {1, 2} for _, weight in weight_rule.body)
+    assert observer.statistics['weight rules'] == 1
+    observer.add_symbolic_atoms(session.control.symbolic_atoms)
+    assert observer.rule_as_text(observer.rules_defining('b')[0]) == '{b;c;d}.'
+
+
+@run_with_clingo_module_only
+def test_through_solve():
+    observer = GroundProgramObserver()
+    answers = clyngor.solve(inline='{a(1..3)}. b(X) :- a(X).', grounding_observers=[observer])
+    assert len(tuple(answers)) == 8
+    assert observer.rules_by_predicate() == {('a', 1): 3, ('b', 1): 3}
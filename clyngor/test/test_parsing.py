@@ -1,4 +1,5 @@
 import pytest
+import itertools
 
 from clyngor import parsing, answer_set_to_str
 from clyngor.parsing import Parser
@@ -333,6 +334,106 @@ def test_multithread_with_progression():
     assert next(expected_optimization, None) is None
 
 
+def test_tokenizer_same_as_arpeggio():
+    strings = (
+        '',
+        'a b(1) -c(-2,"3")',
+        r'a(b,10) c(d("a",d_d),"v,\"v\"",c) d(-2,0)',
+        'a((1,),(b,c(d)),(e)) f(g((1,2),(3,))) 4 "text"',
+        'a(" lead","trail ") b( c , (d,e) )\n',
+    )
+    options = ((False, True), (True, True), (False, False))
+    for string in strings:
+        for (collapse_atoms, collapse_args), discard_quotes, first_arg_only, parse_integer \
+                in itertools.product(options, (False, True), (False, True), (False, True)):
+            parser = Parser(collapse_atoms, collapse_args, discard_quotes,
+                            first_arg_only, parse_integer=parse_integer)
+            expected = parser.arpeggio_parse_terms(string)
+            assert parser.tokenizer.parse_terms(string) == expected
+            assert parser.parse_terms(string) == expected
+
+
+def test_tokenizer_fallback():
+    """Show that unexpected inputs are delegated to arpeggio"""
+    for string in ('a(X)', 'a(b,)', 'a b(', 'A'):
+        with pytest.raises(ValueError):
+            parsing.AtomTokenizer().parse_terms(string)
+        assert Parser().parse_terms(string) == Parser().arpeggio_parse_terms(string)
+    assert Parser().parse_terms('a(X) b') == {('a', ())}
+
+
+def test_parser_cache():
+    from clyngor.answers import Answers
+    parsing.cached_parser.cache_clear()
+    answers = tuple(Answers(['a(b(1),"c")'] * 10).careful_parsing)
+    assert set(answers) == {frozenset({('a', ('b(1)', '"c"'))})}
+    info = parsing.cached_parser.cache_info()
+    assert (info.misses, info.hits) == (1, 9)
+    assert parsing.compiled_grammar() is parsing.compiled_grammar()
+
+
+def test_parser_cache_key():
+    parsing.cached_parser.cache_clear()
+    parser = parsing.cached_parser(False, True, False, False, parse_integer=True)
+    assert parsing.cached_parser() is parser
+    assert parsing.cached_parser(collapse_atoms=False, collapse_args=True) is parser
+    info = parsing.cached_parser.cache_info()
+    assert (info.misses, info.hits) == (1, 2)
+
+
+def test_cached_parser_in_threads():
+    from concurrent.futures import ThreadPoolExecutor
+    def parse(idx:int) -> bool:
+        string = ' '.join('p{}({},f(x{}))'.format(idx, arg, arg) for arg in range(300))
+        expected = frozenset(('p' + str(idx), (arg, 'f(x{})'.format(arg))) for arg in range(300))
+        return all(parsing.cached_parser().arpeggio_parse_terms(string) == expected
+                   for _ in range(5))
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        assert all(executor.map(parse, range(8)))
+
+
+def test_json_output():
+    parsed = parsing.parse_clasp_json_output(CLINGO_JSON_OUTPUT_OPTIMIZATION.splitlines(),
+                                             yield_stats=True, yield_info=True)
+    expected_answer = iter(('c("x,}") b', 'c("x,}") a'))
+    expected_optimization = iter(((2,), (1,)))
+    expected_number = iter((1, 2))
+    types = []
+    for type, payload in parsed:
+        types.append(type)
+        if type == 'answer':
+            assert payload == next(expected_answer)
+        elif type == 'answer_number':
+            assert payload == next(expected_number)
+        elif type == 'optimization':
+            assert payload == next(expected_optimization)
+        elif type == 'optimum found':
+            assert payload is True
+        elif type == 'statistics':
+            assert payload['Models'] == {'Number': 2, 'More': 'no', 'Optimum': 'yes',
+                                         'Optimal': 1, 'Costs': [1]}
+            assert payload['Calls'] == 1
+            assert payload['Time']['Total'] == 0.001
+        elif type == 'info':
+            assert payload == ('clingo version 5.8.2', 'OPTIMUM FOUND')
+        else:  # impossible
+            assert False
+    assert types[-3:] == ['optimum found', 'statistics', 'info']
+    assert next(expected_answer, None) is None
+    assert next(expected_optimization, None) is None
+
+
+def test_json_output_unsat():
+    parsed = parsing.parse_clasp_json_output(CLINGO_JSON_OUTPUT_UNSATISFIABLE)
+    assert tuple(parsed) == (('unsat', True),)
+
+
+def test_json_output_incomplete():
+    lines = CLINGO_JSON_OUTPUT_OPTIMIZATION.splitlines()[:20]
+    parsed = tuple(parsing.parse_clasp_json_output(lines, yield_stats=True))
+    assert parsed == (('answer_number', 1), ('answer', 'c("x,}") b'), ('optimization', (2,)))
+
+
 OUTCLASP_TIME_LIMIT = """clingo version 4.5.4
 Reading from search.lp ...
 Solving...
@@ -489,3 +590,84 @@ Answer: 2
 b
 Optimization: 3296
 """
+
+
+CLINGO_JSON_OUTPUT_OPTIMIZATION = """{
+  "Solver": "clingo version 5.8.2",
+  "Input": [
+    "stdin"
+  ],
+  "Call": [
+    {
+      "Start": 0.000,
+      "Witnesses": [
+        {
+          "Time": 0.001,
+          "Value": [
+            "c(\\"x,}\\")", "b"
+          ],
+          "Costs": [
+            2
+          ]
+        },
+        {
+          "Time": 0.001,
+          "Value": [
+            "c(\\"x,}\\")", "a"
+          ],
+          "Costs": [
+            1
+          ]
+        }
+      ],
+      "Stop": 0.001
+    }
+  ],
+  "Result": "OPTIMUM FOUND",
+  "Models": {
+    "Number": 2,
+    "More": "no",
+    "Optimum": "yes",
+    "Optimal": 1,
+    "Costs": [
+      1
+    ]
+  },
+  "Calls": 1,
+  "Time": {
+    "Total": 0.001,
+    "Solve": 0.000,
+    "Model": 0.000,
+    "Unsat": 0.000,
+    "CPU": 0.001
+  }
+}
+"""
+
+
+CLINGO_JSON_OUTPUT_UNSATISFIABLE = """{
+  "Solver": "clingo version 5.8.2",
+  "Input": [
+    "stdin"
+  ],
+  "Call": [
+    {
+      "Start": 0.000,
+      "Stop": 0.000
+    }
+  ],
+  "Result": "UNSATISFIABLE",
+  "Models": {
+    "Number": 0,
+    "More": "no"
+  },
+  "Calls": 1,
+  "Time": {
+    "Total": 0.000,
+    "Solve": 0.000,
+    "Model": 0.000,
+    "Unsat": 0.000,
+    "CPU": 0.000
+  }
+}
+"""
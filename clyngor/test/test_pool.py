@@ -0,0 +1,76 @@
+"""Tests of the SolverPool, dispatching jobs to clingo module workers"""
+
+import pytest
+import threading
+from clyngor import SolverPool, ASPSyntaxError, solve
+from .definitions import onlyif_clingo_module_available
+
+
+@onlyif_clingo_module_available
+def test_pool_solving():
+    with SolverPool(max_workers=2, max_jobs_per_worker=3) as pool:
+        for idx in range(10):
+            answers = pool.solve(inline='p({}). 1{{q(1..3)}}1.'.format(idx))
+            assert set(answers) == {
+                frozenset({('p', (idx,)), ('q', (value,))}) for value in (1, 2, 3)
+            }
+        counters = pool.counters
+    assert counters['jobs'] == counters['completed'] == 10
+    assert counters['models'] == 30
+    assert counters['failed'] == 0
+    assert counters['throughput'] > 0
+
+
+@onlyif_clingo_module_available
+def test_pool_same_as_solve():
+    source = '1{p(1..4)}2. q("a,b",(1,2)). #const c=1. r(c).'
+    with SolverPool(max_workers=1) as pool:
+        found = set(pool.solve(inline=source, constants={'c': 2}))
+    expected = set(solve(inline=source, constants={'c': 2}, use_clingo_module=False))
+    assert len(found) == 10
+    assert found == expected
+
+
+@onlyif_clingo_module_available
+def test_pool_optimization():
+    source = '1{p(1..4)}2. #minimize{X:p(X)}.'
+    with SolverPool(max_workers=1) as pool:
+        *_, (model, opt) = pool.solve(inline=source).with_optimization
+    assert model == {('p', (1,))}
+    assert opt == [1]
+
+
+@onlyif_clingo_module_available
+def test_pool_concurrent_calls():
+    results = {}
+    def run(pool, idx):
+        results[idx] = frozenset(pool.solve(inline='a({}).'.format(idx)))
+    with SolverPool(max_workers=2) as pool:
+        threads = [threading.Thread(target=run, args=(pool, idx)) for idx in range(8)]
+        for thread in threads: thread.start()
+        for thread in threads: thread.join()
+    assert results == {idx: frozenset({frozenset({('a', (idx,))})}) for idx in range(8)}
+
+
+@onlyif_clingo_module_available
+def test_pool_error():
+    with SolverPool(max_workers=1) as pool:
+        with pytest.raises(ASPSyntaxError) as excinfo:
+            pool.solve(inline='a(.')
+        assert excinfo.value.payload['lineno'] == 1
+        assert tuple(pool.solve(inline='a.')) == (frozenset({('a', ())}),)
+        assert pool.counters['failed'] == 1
+
+
+@onlyif_clingo_module_available
+def test_pool_statuses_and_programs():
+    with SolverPool(max_workers=1) as pool:
+        answers = pool.solve(inline='a. :- a.')
+        assert tuple(answers) == ()
+        assert answers.is_unsatisfiable
+        assert not answers.is_unknown
+        answers = pool.solve(inline='a.')
+        assert tuple(answers) == (frozenset({('a', ())}),)
+        assert not answers.is_unsatisfiable
+        answers = pool.solve(inline='#program p(n). q(n).', programs=[('p', [1]), ('p', ['b'])])
+        assert tuple(answers) == (frozenset({('q', (1,)), ('q', ('b',))}),)
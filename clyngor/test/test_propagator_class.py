@@ -1,8 +1,9 @@
 """Tests the clyngor' Propagator class and the underlying API"""
 
+import pytest
 import textwrap
 import clyngor
-from .definitions import onlyif_python_support, skipif_no_clingo_module
+from .definitions import onlyif_python_support, skipif_no_clingo_module, onlyif_clingo_module_available, run_with_clingo_module_only
 
 
 ASP_CODE = """
@@ -155,3 +156,151 @@ def test_pyconstraint_from_python():
         frozenset({('b', (1,))}),
         frozenset({('b', (3,))}),
     }
+
+
+@onlyif_clingo_module_available
+def test_pyconstraint_with_assumptions():
+    from clyngor import Constraint, Variable as V
+    constraint = Constraint(lambda inputs: inputs['b', (2,)], {('b', (V,))})
+    models = set(constraint.run_with(inline='1{b(1..3)}1.',
+                                     assumptions=[(('b', (1,)), False)]))
+    assert models == {frozenset({('b', (3,))})}
+
+
+@onlyif_clingo_module_available
+def test_pyconstraint_with_inline_chunks():
+    from clyngor import Constraint, Variable as V
+    constraint = Constraint(lambda inputs: inputs['b', (2,)], {('b', (V,))})
+    models = set(constraint.run_with(inline=['n(1..3).', '1{b(X): n(X)}1.', '#show b/1.']))
+    assert models == {frozenset({('b', (1,))}), frozenset({('b', (3,))})}
+
+
+@onlyif_clingo_module_available
+def test_followed_atoms_index():
+    from clyngor import Propagator, Variable as V
+    class Recorder(Propagator):
+        def on_all_input(self, values:dict):
+            self.inputs = set(values)
+    prop = Recorder(follow=[('p', (1, V)), ('q',), 'r(2)'])
+    models = tuple(prop.run_with(inline='p(1..2,1..2). q. q(1). r(1..2). s(1,1). {t}.'))
+    assert len(models) == 2
+    assert prop.inputs == {('p', (1, 1)), ('p', (1, 2)), ('q', ()), ('q', (1,)), 'r(2)'}
+
+
+@onlyif_clingo_module_available
+def test_incremental_assignment():
+    import clingo
+    from clyngor import Propagator, Variable as V
+    class Checker(Propagator):
+        def __init__(self):
+            super().__init__(follow=[('p', (V, V))])
+            self.nb_check = 0
+        def on_any_input(self, values):
+            assert len(values) == 16
+            for atom in values:
+                lit = self._literals[atom]
+                assert values[atom] == self.assignment.value(lit), atom
+            self.nb_check += 1
+        def propagate(self, ctl, changes):
+            self.assignment = ctl.assignment
+            super().propagate(ctl, changes)
+    checker = Checker()
+    ctl = clingo.Control(['-n', '20'])
+    ctl.add('base', [], '1{p(X,1..4)}1 :- X=1..4. 1{p(1..4,Y)}1 :- Y=1..4.')
+    ctl.ground([('base', [])])
+    ctl.register_propagator(checker)
+    assert ctl.solve().satisfiable
+    assert checker.nb_check > 20
+
+
+def pigeon_constraint(inputs) -> set:
+    """Yield the two pigeons in the same hole, if any"""
+    holes = {}
+    for atom, value in inputs.items():
+        if value:
+            hole = atom[1][1]
+            if hole in holes:
+                return {atom, holes[hole]}
+            holes[hole] = atom
+
+
+@onlyif_clingo_module_available
+def test_pyconstraint_with_responsible_atoms():
+    from clyngor import Constraint, Variable as V
+    constraint = Constraint(pigeon_constraint, {('p', (V, V))})
+    models = set(constraint.run_with(inline='1{p(P,H): H=1..3}1 :- P=1..3.'))
+    assert len(models) == 6  # permutations
+    constraint = Constraint(pigeon_constraint, {('p', (V, V))})
+    assert not set(constraint.run_with(inline='1{p(P,H): H=1..6}1 :- P=1..7.'))
+
+
+@onlyif_clingo_module_available
+def test_pyconstraint_with_single_responsible_atom():
+    from clyngor import Constraint, Variable as V
+    constraint = Constraint(lambda inputs: ('b', (2,)) if inputs['b', (2,)] else None,
+                            {('b', (V,))})
+    models = set(constraint.run_with(inline='1{b(1..3)}1.'))
+    assert models == {frozenset({('b', (1,))}), frozenset({('b', (3,))})}
+
+
+@onlyif_clingo_module_available
+def test_pyconstraint_inputs_are_kept():
+    from clyngor import Constraint, Variable as V
+    seen = []
+    def formula(inputs):
+        seen.append(inputs)
+        return False
+    models = set(Constraint(formula, {('b', (V,))}).run_with(inline='1{b(1..3)}1.'))
+    assert len(models) == 3
+    assert all(isinstance(inputs, dict) for inputs in seen)
+    # each formula call kept the values of a model
+    assert {frozenset(atom for atom, value in inputs.items() if value)
+            for inputs in seen} == models
+
+
+@onlyif_clingo_module_available
+def test_pyconstraint_with_unassigned_responsible_atom():
+    from clyngor import Propagator
+    class Bad(Propagator):
+        def on_any_input(self, values):
+            return {('a', ()), ('b', ())}
+    with pytest.raises(RuntimeError, match='is not assigned'):  # ValueError, as seen through clingo
+        set(Bad(follow=[('a', ()), ('b', ())]).run_with(inline='{a;b}.'))
+
+
+@onlyif_clingo_module_available
+def test_multithreaded_propagator():
+    import clingo
+    from clyngor import Constraint, Variable as V
+    class CheckedConstraint(Constraint):
+        def propagate(self, ctl, changes):
+            super().propagate(ctl, changes)
+            self.threads.add(ctl.thread_id)
+            values = self._states[ctl.thread_id].values
+            for atom, lit in self._literals.items():
+                assert values[atom] == ctl.assignment.value(lit), atom
+    source = '1{p(P,H): H=1..4}1 :- P=1..4.'
+    constraint = CheckedConstraint(pigeon_constraint, {('p', (V, V))})
+    constraint.threads = set()
+    models = set(constraint.run_with(inline=source, threads=4))
+    assert len(models) == 24  # permutations
+    assert constraint.threads == {0, 1, 2, 3}
+
+
+@onlyif_clingo_module_available
+def test_multithreaded_main_with_propagator():
+    import clingo
+    from clyngor import Constraint, Variable as V, Main
+    constraint = Constraint(pigeon_constraint, {('p', (V, V))})
+    ctl = clingo.Control(clyngor.solving.solver_conf_options({'threads': 3}))
+    main = Main(inline='1{p(P,H): H=1..3}1 :- P=1..3.', propagators=constraint, generator=True)
+    assert len(set(main(ctl))) == 6
+
+
+@run_with_clingo_module_only
+def test_multithreaded_solve_with_propagator():
+    from clyngor import Constraint, Variable as V, solve
+    constraint = Constraint(pigeon_constraint, {('p', (V, V))})
+    models = solve(inline='1{p(P,H): H=1..3}1 :- P=1..3.', propagators=constraint,
+                   solver_conf={'threads': 3})
+    assert len(set(models)) == 6
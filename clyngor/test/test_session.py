@@ -0,0 +1,55 @@
+"""Tests of the Session, allowing multi-shot solving"""
+
+import pytest
+from clyngor import Session, ClingoAnswers
+from .definitions import onlyif_clingo_module_available
+
+
+@onlyif_clingo_module_available
+def test_session_externals():
+    session = Session(inline='#external go. #external arg(1..2). p(X) :- go, arg(X). #show p/1.')
+    session.ground()
+    assert set(session.solve()) == {frozenset()}
+    session.assign_external('go', True).assign_external(('arg', (1,)), True)
+    answers = session.solve()
+    assert isinstance(answers, ClingoAnswers)
+    assert set(answers) == {frozenset({('p', (1,))})}
+    session.assign_external(('arg', (2,)), None)  # free: both models are possible
+    assert set(session.solve()) == {
+        frozenset({('p', (1,))}),
+        frozenset({('p', (1,)), ('p', (2,))}),
+    }
+    session.release_external('go')
+    assert set(session.solve()) == {frozenset()}
+
+
+@onlyif_clingo_module_available
+def test_session_incremental_grounding():
+    session = Session(inline='#const max=3.', nb_model=1)
+    session.add('step(k).', program='step', params=['k'])
+    session.add('last(K) :- step(K), not step(K+1).', program='check', params=['k'])
+    session.ground()
+    for step in range(1, 4):
+        session.ground([('step', [step]), ('check', [step])])
+        models = tuple(session.solve().by_predicate)
+        assert len(models) == 1
+        assert models[0]['step'] == {(k,) for k in range(1, step + 1)}
+    assert len(tuple(session.solve(nb_model=0))) == 1
+
+
+@onlyif_clingo_module_available
+def test_session_constants_and_statistics():
+    session = Session(inline='#const n=1. p(n).', constants={'n': 42})
+    session.ground({'base': ()})
+    assert set(session.solve()) == {frozenset({('p', (42,))})}
+    assert session.statistics['summary']['models']['enumerated'] == 1
+
+
+@onlyif_clingo_module_available
+def test_session_assumptions():
+    session = Session(inline='1{p(1..3)}1. q :- p(1).').ground()
+    assert set(session.solve(assumptions=['q'])) == {frozenset({('p', (1,)), ('q', ())})}
+    assert set(session.solve(assumptions=[('p', (3,))])) == {frozenset({('p', (3,))})}
+    assert len(set(session.solve(assumptions=[(('p', (3,)), False)]))) == 2
+    assert set(session.solve(assumptions=['r'])) == set()
+    assert len(set(session.solve())) == 3  # assumptions are not kept
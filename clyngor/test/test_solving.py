@@ -1,9 +1,11 @@
 
 import pytest
+import tempfile
+import asyncio
 from .test_api import asp_code  # fixture
 import clyngor
-from clyngor import solve
-from .definitions import run_with_clingo_binary_only, run_with_clingo_module_only
+from clyngor import solve, solve_many, asolve
+from .definitions import run_with_clingo_binary_only, run_with_clingo_module_only, onlyif_clingo_module_available
 
 
 @pytest.fixture
@@ -36,23 +38,271 @@ def test_constants(asp_code_with_constants):
 
 LITERALS_ARE_SHOWN = 'a.  link(a).  #show link/1.  #show 3. #show "hello !".'
 
-@run_with_clingo_module_only
-def test_literal_outputs_by_show():
-    with pytest.raises(RuntimeError) as excinfo:
-        # If this fails, there is some chance the clingo module
-        #  now accepts litterals in output.
-        answers = tuple(solve(inline=LITERALS_ARE_SHOWN).by_predicate)
-
-@run_with_clingo_binary_only
-def test_literal_outputs_by_show_working():
+def assert_literal_outputs_by_show():
     answers = tuple(solve(inline=LITERALS_ARE_SHOWN).by_predicate)
-    print(answers)
     assert len(answers) == 1
     answer = answers[0]
-    print(answers)
     assert len(answer) == 3
     assert set(answer) == {'link', '"hello !"', 3}
     assert answer == {'link': {('a',)}, '"hello !"': {()}, 3: {()}}
 
+@run_with_clingo_module_only
+def test_literal_outputs_by_show():
+    assert_literal_outputs_by_show()
+
+@run_with_clingo_binary_only
+def test_literal_outputs_by_show_working():
+    assert_literal_outputs_by_show()
+
+
+@run_with_clingo_binary_only
+def test_json_output_format():
+    source = '1{p(1..3)}2. q("a,b",(1,2)). #minimize{X:p(X)}.'
+    text = solve(inline=source, options='--opt-mode=optN')
+    json = solve(inline=source, options='--opt-mode=optN', output_format='json')
+    assert '--outf=2' in json.command
+    assert set(json.with_optimization) == set(text.with_optimization)
+    assert json.statistics['Models']['Optimal'] == 1
+    assert isinstance(json.statistics['Time']['Total'], float)
+
+
+@run_with_clingo_binary_only
+def test_json_output_format_unsat():
+    answers = solve(inline='a. :- a.', output_format='json')
+    assert tuple(answers) == ()
+    assert answers.is_unsatisfiable
+
+
+def test_bad_output_format():
+    with pytest.raises(ValueError):
+        clyngor.command(output_format='xml')
+
+
+@run_with_clingo_binary_only
+def test_solve_many():
+    jobs = {value: {'constants': {'a': value}} for value in range(1, 6)}
+    jobs['bad'] = {'inline': 'q(.'}
+    results = dict(solve_many(jobs, max_workers=3, inline='#const a=0. p(a).'))
+    assert set(results) == set(jobs)
+    assert isinstance(results.pop('bad'), clyngor.ASPSyntaxError)
+    for value, answers in results.items():
+        assert tuple(answers) == (frozenset({('p', (value,))}),)
+
+
+@run_with_clingo_binary_only
+def test_solve_many_formatting():
+    jobs = [('x', {'inline': 'p(1,2).'}), ('y', {'inline': 'p(3,4).'})]
+    found = {key: tuple(answers.by_predicate.first_arg_only)
+             for key, answers in solve_many(jobs)}
+    assert found == {'x': ({'p': frozenset({1})},), 'y': ({'p': frozenset({3})},)}
+
+
+def test_solve_many_bounded():
+    import gc, weakref
+    from clyngor.solving import _run_concurrently
+    class Result: pass
+    submitted, results = [], []
+    def jobs():
+        for idx in range(20):
+            submitted.append(idx)
+            yield idx, idx
+    def run_job(idx:int) -> Result:
+        return Result()
+    for key, result in _run_concurrently(run_job, jobs(), max_workers=2):
+        assert len(submitted) <= len(results) + 2  # at most max_workers jobs in flight
+        results.append(weakref.ref(result))
+        del result
+        gc.collect()
+        assert sum(1 for ref in results if ref() is not None) <= 1
+    assert len(results) == 20
+
+
+@run_with_clingo_binary_only
+def test_asolve():
+    source = '1{p(1..3)}2. #minimize{X:p(X)}.'
+    async def run():
+        return [answer async for answer in asolve(inline=source).by_predicate.with_optimality]
+    found = asyncio.run(run())
+    expected = list(solve(inline=source).by_predicate.with_optimality)
+    assert found == expected
+    assert found[-1][2] is True, "last model is optimal"
+
+
+@run_with_clingo_binary_only
+def test_asolve_concurrent_and_errors():
+    async def collect(source):
+        return frozenset([answer async for answer in asolve(inline=source)])
+    async def run():
+        return await asyncio.gather(*map(collect, ('a.', 'b;c.', 'd(.')),
+                                    return_exceptions=True)
+    first, second, third = asyncio.run(run())
+    assert first == {frozenset({('a', ())})}
+    assert second == {frozenset({('b', ())}), frozenset({('c', ())})}
+    assert isinstance(third, clyngor.ASPSyntaxError)
+
+
+@run_with_clingo_binary_only
+def test_asolve_cancellation():
+    models = []
+    async def consume():
+        async for model in asolve(inline='{p(1..100)}.'):  # more models than wanted
+            models.append(model)
+    async def run():
+        task = asyncio.ensure_future(consume())
+        while not models:
+            await asyncio.sleep(0.01)
+        task.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await task
+    asyncio.run(asyncio.wait_for(run(), timeout=30))
+    assert models
+
+
+@run_with_clingo_binary_only
+def test_cautious_and_brave():
+    source = '1{a;b;c}2. d(1). e:- a, b.'
+    assert clyngor.cautious(inline=source) == {('d', (1,))}
+    assert clyngor.brave(inline=source) == {('a', ()), ('b', ()), ('c', ()), ('d', (1,)), ('e', ())}
+    assert clyngor.cautious(inline='a. :- a.') is None
+
+
+@run_with_clingo_binary_only
+def test_consequences_approximations():
+    source = '1{a;b;c}2. d(1).'
+    approximations = tuple(clyngor.consequences('cautious', inline=source).by_predicate)
+    assert approximations[-1] == {'d': {(1,)}}
+    assert len(approximations) > 1
+    assert all(approx.keys() >= {'d'} for approx in approximations)
+    with pytest.raises(ValueError):
+        clyngor.consequences('skeptical', inline=source)
+
+
+@run_with_clingo_binary_only
+def test_count_models():
+    assert clyngor.count_models(inline='{p(1..10)}.') == 1024
+    assert clyngor.count_models(inline='{p(1..10)}.', nb_model=100) == 100
+    assert clyngor.count_models(inline='a. :- a.') == 0
+    assert clyngor.count_models(inline='#const n=2. {p(1..n)}.', constants={'n': 3}) == 8
+    with pytest.raises(clyngor.ASPSyntaxError):
+        clyngor.count_models(inline='p(.')
+
+
+@run_with_clingo_module_only
+def test_count_models_with_module():
+    assert clyngor.count_models(inline='{p(1..10)}.') == 1024
+    assert clyngor.count_models(inline='{p(1..10)}.', nb_model=100) == 100
+    assert clyngor.count_models(inline='a. :- a.') == 0
+
+
+ASSUMPTIONS_SOURCE = '1{p(1..3)}1. q :- p(1).'
+
+def assert_assumptions_handled():
+    answers = clyngor.solve(inline=ASSUMPTIONS_SOURCE, assumptions=[('p', (2,))])
+    assert set(answers) == {frozenset({('p', (2,))})}
+    answers = clyngor.solve(inline=ASSUMPTIONS_SOURCE, assumptions=[(('p', (2,)), False), 'q'])
+    assert set(answers) == {frozenset({('p', (1,)), ('q', ())})}
+    answers = clyngor.solve(inline=ASSUMPTIONS_SOURCE, assumptions=['r'])
+    assert set(answers) == set()
+    answers = clyngor.solve(inline=ASSUMPTIONS_SOURCE, assumptions=[('r', False)])
+    assert len(set(answers)) == 3
+
+@run_with_clingo_binary_only
+def test_assumptions():
+    assert_assumptions_handled()
+    with pytest.raises(ValueError):
+        clyngor.solve(inline=ASSUMPTIONS_SOURCE, assumptions=[1])
+
+@run_with_clingo_module_only
+def test_assumptions_with_module():
+    assert_assumptions_handled()
+
+
+INLINE_CHUNKS = ('q(1..2).', '1{p(X): q(X)}1.', '#show p/1.')
+
+@run_with_clingo_binary_only
+def test_inline_chunks():
+    answers = clyngor.solve(inline=INLINE_CHUNKS)
+    assert set(answers) == {frozenset({('p', (1,))}), frozenset({('p', (2,))})}
+
+@run_with_clingo_module_only
+def test_inline_chunks_without_tempfile(monkeypatch):
+    def forbidden(*args, **kwargs):
+        raise AssertionError("No tempfile should be created")
+    monkeypatch.setattr(tempfile, 'NamedTemporaryFile', forbidden)
+    answers = clyngor.solve(inline=INLINE_CHUNKS)
+    assert set(answers) == {frozenset({('p', (1,))}), frozenset({('p', (2,))})}
+    assert clyngor.count_models(inline=INLINE_CHUNKS) == 2
+
+
+@run_with_clingo_module_only
+def test_custom_running_sequence():
+    def running_sequence(programs, files, nb_model, propagators, observers, generator):
+        return clyngor.Main(programs=programs, files=files, nb_model=nb_model,
+                            propagators=propagators, observers=observers,
+                            generator=generator)
+    answers = clyngor.solve(inline=INLINE_CHUNKS, running_sequence=running_sequence,
+                            assumptions=[('p', (2,))])
+    assert set(answers) == {frozenset({('p', (2,))})}
+    with pytest.raises(ValueError):
+        clyngor.solve(inline='{p(1..25)}.', time_limit=1, running_sequence=running_sequence)
+
+
+@run_with_clingo_module_only
+def test_constants_with_module(asp_code_with_constants):
+    answers = solve(inline=asp_code_with_constants, constants={'a': 2})
+    assert set(answers) == set(solve(inline=asp_code_with_constants, constants={'a': 2},
+                                     use_clingo_module=False))
+
+
+SOLVER_CONF = {'threads': 2, 'configuration': 'trendy', 'heuristic': 'Vmtf', 'opt_strategy': 'usc'}
+
+@run_with_clingo_binary_only
+def test_solver_conf():
+    answers = solve(inline='1{p(1..3)}1. #minimize{X: p(X)}.', solver_conf=SOLVER_CONF)
+    assert '--configuration=trendy' in answers.command
+    assert '--parallel-mode=2' in answers.command
+    assert frozenset({('p', (1,))}) in set(answers)
+    with pytest.raises(ValueError):
+        solve(inline='a.', solver_conf={'thread': 2})
+
+@run_with_clingo_module_only
+def test_solver_conf_with_module():
+    answers = solve(inline='1{p(1..3)}1. #minimize{X: p(X)}.', solver_conf=SOLVER_CONF)
+    assert frozenset({('p', (1,))}) in set(answers)
+
+@onlyif_clingo_module_available
+def test_apply_solver_conf():
+    import clingo
+    ctl = clingo.Control(clyngor.solving.solver_conf_options({'threads': 2}))
+    clyngor.solving.apply_solver_conf(ctl.configuration, {
+        'configuration': 'trendy', 'heuristic': 'Vmtf', 'opt_strategy': 'usc'})
+    assert ctl.configuration.configuration == 'trendy'
+    assert ctl.configuration.solve.parallel_mode.startswith('2,')
+    for idx in range(len(ctl.configuration.solver)):
+        assert ctl.configuration.solver[idx].heuristic.startswith('vmtf')
+        assert ctl.configuration.solver[idx].opt_strategy.startswith('usc')
+
+def test_tune():
+    candidates = [{'configuration': 'jumpy'}, {'configuration': 'tweety', 'threads': 1}]
+    ranking = clyngor.tune(inline='1{p(1..3)}1. #minimize{X: p(X)}.',
+                           candidates=candidates, budget=10, nb_model=0)
+    assert len(ranking) == 2
+    assert {frozenset(conf.items()) for conf, _ in ranking} == {frozenset(conf.items()) for conf in candidates}
+    assert all(elapsed is not None for _, elapsed in ranking)
+    assert ranking[0][1] <= ranking[1][1]
+
+
+def test_tune_waiting_and_timeout():
+    # queued candidates are not charged their waiting time
+    ranking = clyngor.tune(inline='p(1..800). q(X,Y) :- p(X), p(Y), X<Y. #show.',
+                           budget=2, max_workers=1)
+    assert len(ranking) == len(clyngor.solving.TUNING_CANDIDATES)
+    assert all(elapsed is not None for _, elapsed in ranking)
+    # optimization interrupted by the budget
+    hard = ('p(1..30). {q(X,Y)} :- p(X), p(Y). #minimize{1,X,Y: q(X,Y); -1,X,Y: q(X,Y), q(Y,X), X<Y}.'
+            ':- q(X,Y), q(X,Z), Y<Z, #count{W: q(W,Y)}>2.')
+    (_, elapsed), = clyngor.tune(inline=hard, candidates=[{}], budget=1, nb_model=0)
+    assert elapsed is None
+
 
 # TODO: test solving.command
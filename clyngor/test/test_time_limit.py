@@ -1,6 +1,7 @@
+import time
 import pytest
-from clyngor import solve
-from .definitions import run_with_clingo_binary_only
+from clyngor import solve, count_models
+from .definitions import run_with_clingo_binary_only, run_with_clingo_module_only
 
 
 @pytest.mark.slow
@@ -41,6 +42,26 @@ def test_no_time_limit_queens():
     assert sum(1 for answer in answers) == 1
 
 
+
+@pytest.mark.slow
+@run_with_clingo_module_only
+def test_time_limit_with_solutions_with_module():
+    start = time.time()
+    answers = solve([], inline=SUDOKU, time_limit=1)
+    nb_answer = sum(1 for answer in answers)
+    assert nb_answer > 1
+    assert time.time() - start < 3
+    assert count_models(inline=SUDOKU, time_limit=1) > 1
+
+
+@pytest.mark.slow
+@run_with_clingo_module_only
+def test_time_limit_no_solutions_with_module():
+    answers = solve([], inline=QUEENS, time_limit=1)
+    assert sum(1 for answer in answers) == 0
+    assert answers.is_unknown
+    assert not answers.is_unsatisfiable
+
 QUEENS = """
 #const n = 200.
 n(1..n).
@@ -1,6 +1,8 @@
 
+import math
 import tempfile
 from .test_api import asp_code  # fixture
+from .definitions import onlyif_clingo_module_available
 from clyngor import solve, ASP, utils
 
 
@@ -86,3 +88,18 @@ def test_with_opts():
     answer = solve(inline=ASP, options='--opt-mode=optN')
     found = list(utils.opt_models_from_clyngor_answers(answer))
     assert found == [frozenset({('a', ())})]
+
+
+@onlyif_clingo_module_available
+def test_clingo_symbol_conversion():
+    import clingo
+    term = clingo.parse_term('p(1,"a \\"b\\"",f(b,(-1,2)),#inf,#sup,())')
+    expected_args = (1, '"a \\"b\\""', ('f', ('b', ('', (-1, 2)))), -math.inf, math.inf, '')
+    assert utils.clingo_value_to_python(term) == ('p', expected_args)
+    assert utils.clingo_value_to_python(term) is utils.clingo_value_to_python(term)  # memoized
+    assert utils.clingo_symbol_as_python_value(term) == ('p', expected_args)
+    assert utils.clingo_symbol_as_python_value(clingo.parse_term('-q(2)')) == ('-q', (2,))
+    assert utils.clingo_symbol_as_python_value(clingo.parse_term('a')) == ('a', ())
+    assert utils.clingo_symbol_as_python_value(clingo.Number(3)) == (3, ())
+    assert utils.clingo_symbol_as_python_value(clingo.String('s')) == ('"s"', ())
+    assert utils.clingo_value_to_python([clingo.Number(3), 4, 'c']) == (3, 4, '"c"')
@@ -26,6 +26,9 @@ class ASPSyntaxError(SyntaxError):
         super().__init__(*args, **kwargs)
         self.payload = payload
 
+    def __reduce__(self):  # payload is keyword-only, e.g. for multiprocessing
+        return functools.partial(type(self), payload=self.payload), self.args
+
     def __str__(self):
         return self.msg
 
@@ -40,7 +43,7 @@ class ASPWarning(ValueError):
 def parse_clingo_output(clingo_output:[str]):
     "Yield answer sets found in given clingo output"
     yield from (answer for anstype, answer
-                in parsing.Parser().parse_clasp_output(clingo_output)
+                in parsing.cached_parser().parse_clasp_output(clingo_output)
                 if anstype == 'answer')
 
 
@@ -85,42 +88,45 @@ def remove_arguments_quotes(arguments:str):
                     for arg in arguments.split(','))
 
 
+# Maximal number of clingo symbols whose conversion is memoized.
+SYMBOL_CACHE_SIZE = 2**16
+
+
 def clingo_value_to_python(value:object) -> int or str or tuple:
     """Convert a clingo.Symbol object to the python equivalent"""
-    if False and str(type(value).__name__) == 'Symbol':
-        return clingo_symbol_as_python_value(value)
+    if clingo and isinstance(value, clingo.Symbol):
+        return _clingo_symbol_to_python(value)
     elif isinstance(value, int):
         return value
     elif isinstance(value, str):
         return '"' + value + '"'
     elif isinstance(value, (tuple, list)):
         return tuple(map(clingo_value_to_python, value))
-    elif type(value).__name__ == 'Symbol':
-        try:
-            typename = str(value.type).lower()
-            assert typename.startswith('symboltype.')
-            typename = typename[len('symboltype.'):]
-            if typename == 'function':
-                if value.arguments:
-                    pyvalue = (value.name, tuple(map(clingo_value_to_python, value.arguments)))
-                else:
-                    pyvalue = value.name
-            else:  # for any other type, get its python value directly
-                pyvalue = getattr(value, typename)
-        except AttributeError as err:  # inf or sup
-            if value.type == value.type.Infimum:
-                return -math.inf
-            elif value.type == value.type.Supremum:
-                return math.inf
-            else:
-                raise err
-        if typename == 'string':
-            pyvalue = '"' + pyvalue.replace('"', '\\"') + '"'
-        return pyvalue
     raise TypeError("Can't handle values like {} of type {}."
                     "".format(value, type(value)))
 
 
+@functools.lru_cache(maxsize=SYMBOL_CACHE_SIZE)
+def _clingo_symbol_to_python(value) -> int or str or tuple:
+    """Memoized conversion of given clingo.Symbol to the python equivalent"""
+    symtype = value.type
+    if symtype == clingo.SymbolType.Function:
+        arguments = value.arguments
+        if arguments:
+            return value.name, tuple(map(_clingo_symbol_to_python, arguments))
+        return value.name
+    elif symtype == clingo.SymbolType.Number:
+        return value.number
+    elif symtype == clingo.SymbolType.String:
+        return '"' + value.string.replace('"', '\\"') + '"'
+    elif symtype == clingo.SymbolType.Infimum:
+        return -math.inf
+    elif symtype == clingo.SymbolType.Supremum:
+        return math.inf
+    raise TypeError("Can't handle clingo.Symbol like {} of type {}."
+                    "".format(value, symtype))
+
+
 def clingo_symbol_as_python_value_basefunc(term, typename: str) -> object:
     "Convert a clingo.Symbol object to the python equivalent"
     if typename == 'Function':
@@ -138,16 +144,28 @@ def clingo_symbol_as_python_value_basefunc(term, typename: str) -> object:
 
 
 def clingo_symbol_as_python_value(term) -> object:
-    if clingo:
-        types = {
-            clingo.SymbolType.Function: 'Function',
-            clingo.SymbolType.Number: 'Number',
-            clingo.SymbolType.String: 'String',
-        }
-        return clingo_symbol_as_python_value_basefunc(term, types.get(term.type, term.type))
+    """Convert a clingo.Symbol object to an atom, as represented by clyngor"""
+    if clingo and isinstance(term, clingo.Symbol):
+        return _clingo_symbol_as_atom(term)
     else:
         return clingo_symbol_as_python_value_basefunc(term, term.type)
 
+
+@functools.lru_cache(maxsize=SYMBOL_CACHE_SIZE)
+def _clingo_symbol_as_atom(term) -> tuple:
+    """Memoized conversion of given clingo.Symbol to an atom"""
+    symtype = term.type
+    if symtype == clingo.SymbolType.Function:
+        name = ('-' if term.negative else '') + term.name
+        return name, tuple(map(_clingo_symbol_to_python, term.arguments))
+    elif symtype == clingo.SymbolType.String:
+        return '"' + term.string + '"', ()
+    elif symtype == clingo.SymbolType.Number:
+        return term.number, ()
+    raise TypeError("Can't handle clingo.Symbol like {} of type {}."
+                    "".format(term, symtype))
+
+
 def python_value_to_asp(val:str or int or list or tuple, *, args_of_predicate:bool=False) -> str or tuple:
     """Convert given python value in an ASP format"""
     if isinstance(val, (str, int)):
@@ -168,6 +186,65 @@ def python_value_to_asp(val:str or int or list or tuple, *, args_of_predicate:bo
 # python_value_to_asp.in_predicate = lambda x: python_value_to_asp(x, args_of_predicate=True)
 
 
+def as_clingo_symbol(value:object) -> object:
+    """Return the clingo.Symbol equivalent to given value, being either
+    a clingo.Symbol, an ASP string like 'p(1)', an integer,
+    or an atom as represented by clyngor, like ('p', (1,))"""
+    if isinstance(value, clingo.Symbol):
+        return value
+    return clingo.parse_term(python_value_to_asp(value))
+
+
+def symbolic_atoms_index(symbolic_atoms:iter) -> dict:
+    """Return the mapping clingo.Symbol -> program literal
+    of given clingo.SymbolicAtoms"""
+    return {atom.symbol: atom.literal for atom in symbolic_atoms}
+
+
+def split_assumption(assumption:object) -> (object, bool):
+    """Return atom and truth value of given assumption, being either an atom
+    (assumed true) or a pair (atom, truth value)"""
+    if isinstance(assumption, tuple) and len(assumption) == 2 and isinstance(assumption[1], bool):
+        return assumption
+    return assumption, True
+
+
+def assumptions_as_literals(assumptions:iter, index:dict) -> list:
+    """Return given assumptions in the form expected by clingo.Control.solve,
+    using given index (see symbolic_atoms_index) to get the literal of atoms.
+
+    assumptions -- iterable of atoms, pairs (atom, truth value) or literals
+
+    """
+    literals = []
+    for assumption in assumptions:
+        if isinstance(assumption, int) and not isinstance(assumption, bool):
+            literals.append(assumption)  # already a literal
+            continue
+        atom, truth = split_assumption(assumption)
+        symbol = as_clingo_symbol(atom)
+        literal = index.get(symbol)
+        if literal is None:  # unknown atom: let clingo handle it
+            literals.append((symbol, truth))
+        else:
+            literals.append(literal if truth else -literal)
+    return literals
+
+
+def assumptions_as_constraints(assumptions:iter) -> str:
+    """Return ASP integrity constraints equivalent to given assumptions,
+    for solvers not handling them directly"""
+    constraints = []
+    for assumption in assumptions:
+        if isinstance(assumption, int) and not isinstance(assumption, bool):
+            raise ValueError("Literal {} can't be used as assumption without "
+                             "clingo module.".format(assumption))
+        atom, truth = split_assumption(assumption)
+        atom = str(atom) if type(atom).__name__ == 'Symbol' else python_value_to_asp(atom)
+        constraints.append(':- {}{}.'.format('not ' if truth else '', atom))
+    return '\n'.join(constraints)
+
+
 def integers_to_string_atoms(model:iter) -> object:
     """Return an identical structure of (frozen)set, tuple and list, but with integer values as string"""
     if isinstance(model, (list, tuple, frozenset, set)):
@@ -228,7 +305,7 @@ def answer_set_from_str(line:str, collapse_atoms:bool=False,
     ('a', 'b(a)', 'c("text")', 'd')
 
     """
-    yield from parsing.Parser(
+    yield from parsing.cached_parser(
         collapse_atoms=collapse_atoms,
         collapse_args=collapse_args,
         parse_integer=parse_integer
@@ -251,8 +328,11 @@ def save_answers_in_file(answers:iter, filename:str or None=None,
         with tempfile.NamedTemporaryFile('w', delete=False) as ofd:
             filename = ofd.name
     with open(filename, 'w') as ofd:
-        ofd.write(answer_separator.join(answer_set_to_str(answer, atom_sep=atom_separator)
-                                        for answer in answers) + end)
+        for idx, answer in enumerate(answers):
+            if idx:
+                ofd.write(answer_separator)
+            ofd.write(answer_set_to_str(answer, atom_sep=atom_separator))
+        ofd.write(end)
     return filename
 
 
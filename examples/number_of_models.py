@@ -13,3 +13,4 @@ nb_model_announced = models.statistics['Models']
 
 print(f'Number of models    found by clyngor: {nb_model_found}')
 print(f'Number of models announced by clingo: {nb_model_announced}')
+print(f'Number of models   counted by clyngor: {clyngor.count_models(inline="1{n(1..1000)}1.", nb_model=500)}')